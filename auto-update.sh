@@ -1,6 +1,7 @@
 #!/usr/bin/env bash
-# auto-update.sh — Regenerate fleet map and push to GitHub
-# Scheduled to run at 08:45 and 13:00 Saudi Arabia time (GMT+3)
+# auto-update.sh — Regenerate fleet map and push to GitHub, once
+# The scheduled runs (08:45 and 13:00 Saudi Arabia time, and on vault changes) come from
+# com.thc.fleetmap.scheduler.plist: generate.py --schedule --watch --publish
 #
 # To manually run: bash auto-update.sh
 # To test without push: bash auto-update.sh --dry-run
@@ -17,27 +18,15 @@ echo "🚁 THC Fleet Map Auto-Update"
 echo "   $(date '+%Y-%m-%d %H:%M:%S %Z')"
 echo ""
 
-# 1. Run the generator
-echo "📊 Generating fleet map..."
-python3 generate.py
-
-# 2. Check for changes
-if git diff --quiet && git diff --cached --quiet; then
-    echo "✅ No changes detected — skipping push"
-    exit 0
-fi
-
-# 3. Stage and commit
-echo "📦 Committing changes..."
-git add -A
-git commit -m "Auto-update: $(date '+%d %b %Y %H:%M')"
-
-# 4. Push (unless dry-run)
+# 1. Regenerate, then publish the bundle as the single commit on gh-pages
+#    (GitHub Pages serves that branch; this repo's own history no longer grows with every run)
 if [ "$DRY_RUN" = true ]; then
-    echo "🔍 DRY RUN — would push to GitHub"
+    echo "📊 Generating fleet map..."
+    python3 generate.py --bundle
+    echo "🔍 DRY RUN — site built in dist/, not published"
 else
-    echo "🚀 Pushing to GitHub..."
-    git push
+    echo "📊 Generating and publishing fleet map..."
+    python3 generate.py --publish
     echo "✅ Live at: https://willslawrence.github.io/thc-ops-map/"
 fi
 
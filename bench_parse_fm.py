@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Benchmark fleetmap.parse_fm against the original whole-file parser.
+
+Writes notes with the vault's frontmatter shapes and bodies of increasing
+size to a temp dir, checks both parsers agree, and prints per-call times.
+
+    python3 bench_parse_fm.py [--repeat N]
+"""
+import os, sys, timeit, tempfile, argparse
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from fleetmap import parse_fm
+
+def parse_fm_legacy(fp):
+    # parse_fm as it was before the streaming reader: reads the whole note
+    d = {}
+    try:
+        t = open(fp).read()
+        if t.startswith('---'):
+            p = t.split('---', 2)
+            if len(p) >= 3:
+                k, lst = None, []
+                nested_key = None
+                nested_dict = {}
+                for ln in p[1].strip().split('\n'):
+                    stripped = ln.strip()
+                    indent = len(ln) - len(ln.lstrip())
+                    if indent >= 2 and nested_key:
+                        if stripped.startswith('- '):
+                            lst.append(stripped[2:].strip())
+                        elif ':' in stripped:
+                            nk, nv = stripped.split(':', 1)
+                            nv = nv.strip().strip('"').strip("'")
+                            if nv:
+                                nested_dict[nk.strip()] = nv
+                        continue
+                    if nested_key and nested_dict:
+                        d[nested_key] = nested_dict
+                        nested_dict = {}
+                        nested_key = None
+                    if k and lst:
+                        d[k] = lst[0] if len(lst)==1 else ', '.join(lst)
+                        lst = []
+                        k = None
+                    if stripped.startswith('- '):
+                        if k: lst.append(stripped[2:].strip())
+                    elif ':' in stripped:
+                        kk, v = stripped.split(':', 1)
+                        kk = kk.strip()
+                        v = v.strip().strip('"').strip("'")
+                        if v:
+                            d[kk] = v
+                            k = None
+                        else:
+                            nested_key = kk
+                            nested_dict = {}
+                            k = kk
+                            lst = []
+                if nested_key and nested_dict:
+                    d[nested_key] = nested_dict
+                elif k and lst:
+                    d[k] = lst[0] if len(lst)==1 else ', '.join(lst)
+    except: pass
+    return d
+
+HELI_FM = '''---
+registration: HZHC55
+location: OEAO
+status: Serviceable
+current_mission: "Aurora Filming"
+total_fh: "1204:10"
+150hr_rem_fh: "42:56"
+12mo_due: 2026-09-01
+tags:
+  - helicopter
+  - h125
+---
+'''
+MISSION_FM = '''---
+title: Al Fursan Cup
+date: 2026-02-05
+endDate: 2026-02-08
+status: confirmed
+helicopters:
+  Film: HZHC55
+  EMS 1: HZHC57
+  EMS 2: TBD
+Pilots:
+  - Lisa
+  - Nathan
+---
+'''
+LOG_LINE = "08:14:22 | HZHC55 | OEAO-XURC | fuel 420 kg | wind 310/12 | notes: nothing to report\n"
+
+def write_notes(d):
+    notes = [
+        ('helicopter, no body', HELI_FM),
+        ('mission, 2 KB debrief', MISSION_FM + LOG_LINE * 25),
+        ('mission, 200 KB log', MISSION_FM + LOG_LINE * 2500),
+        ('mission, 2 MB log', MISSION_FM + LOG_LINE * 25000),
+    ]
+    out = []
+    for i, (label, text) in enumerate(notes):
+        fp = os.path.join(d, f"note{i}.md")
+        with open(fp, 'w') as f: f.write(text)
+        out.append((label, fp))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    ap.add_argument('--repeat', type=int, default=5, help="timing rounds per note (best is reported)")
+    args = ap.parse_args()
+    with tempfile.TemporaryDirectory() as d:
+        print(f"{'note':<24}{'legacy':>12}{'streaming':>12}{'speed-up':>10}")
+        for label, fp in write_notes(d):
+            assert parse_fm(fp) == parse_fm_legacy(fp), f"parsers disagree on {label}"
+            n = max(1, 20000 // (os.path.getsize(fp) // 1000 + 1))
+            old = min(timeit.repeat(lambda: parse_fm_legacy(fp), number=n, repeat=args.repeat)) / n
+            new = min(timeit.repeat(lambda: parse_fm(fp), number=n, repeat=args.repeat)) / n
+            print(f"{label:<24}{old*1e6:>10.1f}us{new*1e6:>10.1f}us{old/new:>9.1f}x")
+
+if __name__ == "__main__": main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Scaling benchmark for the fleetmap pipeline on a synthetic vault.
+
+Writes a synthetic THC vault (helicopters, pilot folders, active and past
+missions, years of Flights Schedule.md rows) to a temp dir, runs
+fleetmap.generate() on it and times every stage of a cold run (empty caches) and a warm rerun at
+each scale, keeping the fastest of --repeat tries. Results are compared against the baseline in
+bench-baseline.json. The committed one was recorded on a single-core Linux VM at 1x, 10x and 100x;
+timings only compare on the same machine, so re-save it (--save-baseline) where the map actually
+runs, on an otherwise idle machine.
+
+    python3 bench_pipeline.py [--scales 1,10,100,1000] [--repeat N] [--save-baseline]
+    python3 bench_pipeline.py --make-vault DIR [--scale N]   # just write a vault
+
+Vault size at 1x is set with --helis/--pilots/--missions/--past/--rows-per-day
+(each multiplied by the scale) and --years of schedule history.
+"""
+import os, sys, json, random, shutil, argparse, tempfile, contextlib
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import fleetmap
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench-baseline.json")
+NOW = datetime(2026, 2, 4, 13, 0, 0)
+# Vault size at 1x; every count but YEARS scales linearly
+HELIS, PILOTS, MISSIONS, PAST, ROWS_PER_DAY, YEARS = 12, 10, 20, 40, 2, 2
+# Flag stages REGRESSION x slower than the baseline, unless by less than NOISE_MS (timer and scheduler jitter)
+REGRESSION, NOISE_MS = 1.5, 5.0
+LOCS = ['OETH', 'RUH', 'OEHL', 'OEAO']
+STATUSES = ['Serviceable', 'Serviceable', 'Serviceable - MEL', 'Maintenance - 100hr', 'AOG']
+ROLES = ['Film', 'EMS 1', 'EMS 2', 'Camera', 'Standby']
+JOBS = ['Filming - AURORA', 'Reposition - OETH', 'Op Repo OEAO-XURC - AURORA', 'Training', 'Survey flight']
+LOG_LINE = "08:14:22 | HZHC55 | OEAO-XURC | fuel 420 kg | wind 310/12 | notes: nothing to report\n"
+
+def make_vault(d, helis=HELIS, pilots=PILOTS, missions=MISSIONS, past=PAST, rows_per_day=ROWS_PER_DAY, years=YEARS, seed=1):
+    """Write a synthetic vault under d in the real vault's layout"""
+    rnd = random.Random(seed)
+    day = lambda lo, hi: NOW + timedelta(days=rnd.randint(lo, hi))
+    regs = [f"HZHC{50 + i}" for i in range(helis)]
+    names = [f"Pilot{i} Surname{i}" for i in range(pilots)]
+    os.makedirs(f"{d}/Helicopters")
+    for r in regs:
+        st = rnd.choice(STATUSES)
+        fm = [f"registration: {r}", f"location: {rnd.choice(LOCS)}", f"status: {st}",
+              f'total_fh: "{rnd.randint(100, 4000)}:{rnd.randint(0, 59):02}"', f'150hr_rem_fh: "{rnd.randint(0, 149)}:{rnd.randint(0, 59):02}"']
+        if 'MEL' in st: fm += ['mel_ref: "21-05"', f"mel_expiry: {day(5, 90):%Y-%m-%d}", f"mel_rem_days: {rnd.randint(5, 90)}"]
+        if 'Maint' in st or 'AOG' in st: fm += [f"ert: {day(1, 30):%Y-%m-%d}", "notes: Scheduled inspection"]
+        fm += ['tags:', '  - heli', '  - h125']
+        with open(f"{d}/Helicopters/{r}.md", 'w') as f: f.write('---\n' + '\n'.join(fm) + f"\n---\n# {r.replace('HZ', '')}\n")
+    for nm in names:
+        os.makedirs(f"{d}/Pilots/{nm}")
+        with open(f"{d}/Pilots/{nm}/{nm}.md", 'w') as f:
+            f.write(f"# {nm}\n- Medical Certificate Date: {day(-400, 0):%Y-%m-%d}\n"
+                    f"- 30 Mins REMS: {day(-200, 0):%Y-%m}\n- Last Competency Check: {day(-400, 0):%Y-%m-%d}\n")
+    os.makedirs(f"{d}/Missions/Past Missions")
+    for i in range(missions + past):
+        old = i >= missions
+        fm = [f"title: Mission {i}", f"status: {'complete' if old else rnd.choice(['confirmed', 'pending', 'active'])}"]
+        if old or rnd.random() > 0.1:  # a few active missions are still TBD
+            s = day(-365 * years, -30) if old else day(-20, 330)
+            fm += [f"date: {s:%Y-%m-%d}", f"endDate: {s + timedelta(days=rnd.randint(0, 20)):%Y-%m-%d}"]
+        if rnd.random() < 0.5:  # role-based assignment
+            fm += ['helicopters:'] + [f"  {role}: {rnd.choice(regs + ['TBD'])}" for role in rnd.sample(ROLES, rnd.randint(1, 3))]
+        else: fm.append(f"helicopters: {rnd.choice(regs)}")
+        fm += ['Pilots:'] + [f"  - {rnd.choice(names).split()[0]}" for _ in range(rnd.randint(1, 3))]
+        with open(f"{d}/Missions/{'Past Missions/' if old else ''}Mission {i}.md", 'w') as f:
+            f.write('---\n' + '\n'.join(fm) + '\n---\n' + LOG_LINE * rnd.randint(0, 40))
+    # Schedule: `years` of history up to two months ahead, one '## ' header per day
+    with open(f"{d}/Flights Schedule.md", 'w') as f:
+        f.write("# Flights\n")
+        t = NOW - timedelta(days=365 * years - 60)
+        while t <= NOW + timedelta(days=60):
+            f.write(f"## {t:%d %b}\n")
+            for _ in range(rows_per_day):
+                f.write(f"{t:%Y-%m-%d} | {rnd.choice(regs).replace('HZ', '')} | {rnd.choice(JOBS)} | {rnd.choice(names).split()[0]}\n")
+            t += timedelta(days=1)
+
+def forget():
+    # Drop fleetmap's in-memory caches, as if this were a fresh process
+    fleetmap._cache, fleetmap._mindex, fleetmap._schedule = {}, {}, (None, None)
+
+def sizes(args, scale):
+    return [n * scale for n in (args.helis, args.pilots, args.missions, args.past, args.rows_per_day)] + [args.years]
+
+def run_scale(size, tmp, repeat=1):
+    """Cold and warm stage timings (ms) for a vault of this size, each the fastest of repeat tries"""
+    vault, out = f"{tmp}/vault", f"{tmp}/out"
+    make_vault(vault, *size)
+    fleetmap.METRICS = True
+    best = {}
+    for _ in range(repeat):
+        with contextlib.redirect_stdout(open(os.devnull, 'w')):
+            forget()
+            fleetmap.generate(vault, f"{out}/index.html", now=NOW)  # cold: nothing cached on disk or in memory
+            forget()
+            fleetmap.generate(vault, f"{out}/index.html", now=NOW, force=True)  # warm: a fresh process with the on-disk caches, rebuilding every section
+        runs = [json.loads(ln) for ln in open(fleetmap.METRICS_LOG)]
+        shutil.rmtree(out)
+        for k, r in zip(('cold', 'warm'), runs):
+            b = best.setdefault(k, {})
+            for n, ms in (('total', r['ms']), *((n, s['ms']) for n, s in r['stages'].items())): b[n] = min(b.get(n, ms), ms)
+    shutil.rmtree(vault)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    ap.add_argument('--scales', default='1,10,100,1000', help="comma-separated vault scales to run (default: %(default)s)")
+    ap.add_argument('--repeat', type=int, default=3, help="tries per scale; each stage's fastest counts (default: %(default)s)")
+    ap.add_argument('--save-baseline', action='store_true', help=f"store these results as the baseline in {os.path.basename(BASELINE)}")
+    ap.add_argument('--make-vault', metavar='DIR', help="only write a synthetic vault to DIR (see --scale)")
+    ap.add_argument('--scale', type=int, default=1, help="vault scale for --make-vault")
+    for k, n, h in (('helis', HELIS, "HZHC*.md helicopters"), ('pilots', PILOTS, "pilot folders"), ('missions', MISSIONS, "active missions"),
+                    ('past', PAST, "past missions"), ('rows-per-day', ROWS_PER_DAY, "flight schedule rows per day")):
+        ap.add_argument(f'--{k}', type=int, default=n, help=f"{h} at 1x (default: %(default)s)")
+    ap.add_argument('--years', type=int, default=YEARS, help="years of schedule and past-mission history (default: %(default)s)")
+    args = ap.parse_args()
+    if args.make_vault:
+        make_vault(args.make_vault, *sizes(args, args.scale))
+        return print(f"✅ Wrote {args.scale}x vault to {args.make_vault}")
+    try: base = json.load(open(BASELINE))
+    except (OSError, ValueError): base = {}
+    results, slow = {}, 0
+    with tempfile.TemporaryDirectory() as tmp:
+        for sc in args.scales.split(','):
+            h, p, m, pm, rpd, y = sizes(args, int(sc))
+            r = results[sc] = run_scale((h, p, m, pm, rpd, y), tmp, args.repeat)
+            print(f"\n📏 {sc}x  ({h} helis, {p} pilots, {m} + {pm} past missions, {rpd} flights/day over {y}y)")
+            print(f"   {'stage':<16}{'cold':>10}{'warm':>10}{'baseline':>10}")
+            for st in r['cold']:
+                was = base.get(sc, {}).get('warm', {}).get(st)
+                now = r['warm'].get(st, 0)
+                flag = ''
+                if was and now > REGRESSION * was and now - was > NOISE_MS: flag, slow = f"  ⚠️ {now / was:.1f}x slower", slow + 1
+                print(f"   {st:<16}{r['cold'][st]:>8.1f}ms{now:>8.1f}ms{f'{was:.1f}ms' if was else '—':>10}{flag}")
+    if args.save_baseline:
+        with open(BASELINE, 'w') as f: json.dump({**base, **results}, f, indent=1)
+        print(f"\n💾 Baseline saved to {BASELINE}")
+    elif slow:
+        print(f"\n⚠️ {slow} stages regressed against the baseline")
+        sys.exit(1)
+
+if __name__ == "__main__": main()
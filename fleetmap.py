@@ -0,0 +1,1747 @@
+"""THC fleet map generator: Obsidian vault notes in, data.json for index.html out.
+
+    import fleetmap
+    fleetmap.generate(vault_path, html_path, now=datetime(...))
+
+generate() can be called repeatedly from one process (watcher, server, batch
+renderer); parsed notes, the missions index and the schedule index stay warm
+between calls. The loaders take the note path they read and the date-relative
+builders take today, both defaulting to the paths and clock of the current
+generate() call. generate.py and generate_sandbox.py are thin entry points.
+"""
+import os, re, sys, gzip, signal, math, array, fcntl, shutil, subprocess, json, time, heapq, queue, bisect, select, calendar, struct, hashlib, argparse, threading, mimetypes
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as ReadTimeout
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, unquote
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+# Vault and output paths, set by use_paths(). The page is a static shell that
+# renders DATA_FILE; run timestamps go to STAMP_FILE. The caches live in .cache/:
+#   CACHE_FILE      parsed notes, keyed by path and invalidated on mtime/size/inode change
+#   MISSIONS_INDEX  date-sorted summary of every mission note, refreshed from file stat keys
+#   SECTIONS_CACHE  last built data for each section, so partial rebuilds can re-emit the rest
+#   METRICS_LOG     --metrics appends one JSON line per run
+#   RUN_LOCK        held for each generate (+ publish) run, so runs from different processes never overlap
+#   SCHEDULE_LOG    --schedule appends each run's triggers and per-stage latency
+# HISTORY_DIR is not a cache: it holds the fleet-state history (see record_history), and can't be rebuilt.
+# --bundle writes the deployable site (minified page, vendored libraries, data, .gz/.br siblings) to BUILD_DIR.
+# --publish commits it in PUBLISH_GIT, a private bare repo, and force-pushes that as PAGES_BRANCH.
+VAULT = HELIS_DIR = PILOTS_DIR = FLIGHTS_FILE = MISSIONS_DIR = None
+HTML_FILE = DATA_FILE = STAMP_FILE = BUILD_DIR = PUBLISH_GIT = CACHE_FILE = MISSIONS_INDEX = SECTIONS_CACHE = METRICS_LOG = RUN_LOCK = SCHEDULE_LOG = HISTORY_DIR = None
+# Format versions of data.json, the parse cache, the missions index and the history store
+DATA_VERSION, CACHE_VERSION, MISSIONS_INDEX_VERSION, HISTORY_VERSION = 3, 3, 1, 1
+# A --metrics run over SLOW_FACTOR x the median of the last SLOW_WINDOW is flagged
+SLOW_FACTOR, SLOW_WINDOW = 2.0, 20
+# Rolling timeline: whole months from TIMELINE_MONTHS_BACK before this one to TIMELINE_MONTHS_AHEAD after
+TIMELINE_MONTHS_BACK, TIMELINE_MONTHS_AHEAD = 3, 12
+# Timeline lanes alternate above/below the axis; missions in a lane need LANE_PAD clear between them.
+# With TIMELINE_GROW_LANES a busy season opens extra lanes, otherwise overflow is reported.
+TIMELINE_LANES, TIMELINE_GROW_LANES, LANE_PAD = 6, True, timedelta(days=7)
+# Watch mode: wait for DEBOUNCE_S of quiet (at most DEBOUNCE_MAX_S) before rebuilding
+DEBOUNCE_S, DEBOUNCE_MAX_S, POLL_INTERVAL_S = 2.0, 15.0, 5.0
+SECTIONS = ('fleet', 'flights', 'currency', 'timeline')
+# Vault inputs each section is built from; a section is only rebuilt when their stat keys, the date or this code change
+SECTION_INPUTS = {'fleet': ('helis', 'schedule'), 'flights': ('schedule',), 'currency': ('pilots',), 'timeline': ('missions',)}
+# Map position and label of each base. Aircraft at a base are laid out in a grid around it, at least
+# BASE_GRID_COLS wide (square for big groups), BASE_GRID_STEP degrees (lat, lng) apart; the map fits
+# the bases in use plus MAP_PAD of their span on each side
+BASES = {
+    'OETH': (25.213, 46.640, "THUMAMAH"),
+    'RUH': (24.680, 46.820, "ALSALAM (RUH)"),
+    'OEHL': (27.438, 41.686, "HA'IL"),
+    'OEAO': (26.485, 38.126, "AL ULA"),
+}
+BASE_GRID_COLS, BASE_GRID_STEP, MAP_PAD = 3, (0.15, 0.35), 0.15
+# Competency checks show as 'info' this many months past the current one
+CURRENCY_AHEAD_MONTHS = 1
+# Note reads are I/O-bound (iCloud may have to fetch them), so fan them out
+IO_WORKERS = 8
+# A note read gives up after READ_TIMEOUT_S, and once a run has spent READ_BUDGET_S the rest
+# don't wait at all; the note's last good parse is used instead and its section marked stale
+READ_TIMEOUT_S, READ_BUDGET_S = 5.0, 20.0
+# macOS st_flags bit for an iCloud file whose content isn't on disk (reading it blocks on a download)
+SF_DATALESS = 0x40000000
+# History store columns (name, array typecode). Strings are indexes into the store's string table;
+# day counts from HISTORY_EPOCH; -1 is a missing number. flags holds the FLYING and MAINT bits.
+HISTORY_COLS = (('day', 'H'), ('reg', 'H'), ('status', 'H'), ('loc', 'H'), ('rem_fh', 'i'), ('mel_days', 'h'), ('flags', 'B'))
+HISTORY_EPOCH, FLYING, MAINT = datetime(2020, 1, 1), 1, 2
+# --serve: requests check the vault for changes at most every SERVE_CHECK_S, and these files are compressed up front
+SERVE_CHECK_S = 1.0
+SERVE_PRIMED = ('index.html', 'data.json', 'last-updated.json')
+# Without --bundle, the only files --serve hands out of the page's folder (which also holds the generator, vendor/ and history/)
+SERVE_FILES = SERVE_PRIMED + ('sw.js',)
+# /events (Server-Sent Events) sends a keep-alive comment after this long without an update
+SSE_PING_S = 15.0
+
+# --bundle copies unpkg.com libraries the page links to into VENDOR_DIR (once, then they're committed)
+# and links them from BUILD_DIR under content-hashed names
+VENDOR_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'vendor')
+VENDORED = re.compile(r'https://unpkg\.com/([\w.-]+@[\w.-]+)/(?:[\w.-]+/)*([\w.-]+)\.(js|css)')
+
+# --schedule: cron-style (minute hour day-of-month month day-of-week) run times, Riyadh time
+SCHEDULE = ('45 8 * * *', '0 13 * * *')
+# --schedule sleeps at most this long (seconds) between clock checks, so a run due while the Mac slept starts on wake
+CLOCK_TICK_S = 60
+# --publish replaces this branch with a single commit each time, so the Pages repo never grows a history
+PAGES_BRANCH = 'gh-pages'
+# --publish: give up on a fetch or push that takes longer than this (seconds), rather than hang the run
+GIT_NET_TIMEOUT_S = 120
+
+try: import brotli  # optional; --serve offers br variants when it's installed
+except ImportError: brotli = None
+
+def riyadh_now():
+    # Use Saudi Arabia timezone, then strip tz for naive comparisons
+    n = datetime.now(ZoneInfo("Asia/Riyadh"))
+    return datetime(n.year, n.month, n.day, n.hour, n.minute, n.second)
+
+TODAY = riyadh_now()  # the clock for the current run; generate() and watch() move it
+
+def use_paths(vault, html):
+    """Point the loaders at vault and the output at html's folder, dropping warm state for other paths"""
+    global VAULT, HELIS_DIR, PILOTS_DIR, FLIGHTS_FILE, MISSIONS_DIR, HTML_FILE
+    global DATA_FILE, STAMP_FILE, BUILD_DIR, PUBLISH_GIT, CACHE_FILE, MISSIONS_INDEX, SECTIONS_CACHE, METRICS_LOG, RUN_LOCK, SCHEDULE_LOG, HISTORY_DIR, _cache, _mindex, _schedule, _history
+    if (vault, html) == (VAULT, HTML_FILE): return
+    VAULT, HTML_FILE = vault, html
+    HELIS_DIR, PILOTS_DIR = f"{vault}/Helicopters", f"{vault}/Pilots"
+    FLIGHTS_FILE, MISSIONS_DIR = f"{vault}/Flights Schedule.md", f"{vault}/Missions"
+    out = os.path.dirname(html)
+    DATA_FILE, STAMP_FILE = os.path.join(out, "data.json"), os.path.join(out, "last-updated.json")
+    BUILD_DIR, PUBLISH_GIT = os.path.join(out, "dist"), os.path.join(out, ".cache", "publish.git")
+    CACHE_FILE, MISSIONS_INDEX = os.path.join(out, ".cache", "parse-cache.json"), os.path.join(out, ".cache", "missions-index.json")
+    SECTIONS_CACHE, METRICS_LOG = os.path.join(out, ".cache", "sections.json"), os.path.join(out, ".cache", "metrics.jsonl")
+    RUN_LOCK, SCHEDULE_LOG = os.path.join(out, ".cache", "run.lock"), os.path.join(out, ".cache", "schedule.jsonl")
+    HISTORY_DIR = os.path.join(out, "history")
+    _cache, _mindex, _schedule, _history = {}, {}, (None, None), (None, None)
+
+def parse_fm(fp):
+    """Parse a note's YAML frontmatter, reading only up to the closing '---'.
+
+    Handles the subset the vault uses: `key: value`, `key:` followed by a
+    `- item` list (joined with ', ') and `key:` followed by an indented
+    `role: value` block (returned as a dict). Read errors are the caller's
+    to handle (see read_note).
+    """
+    d = {}
+    with open(fp) as f:
+        if not f.readline().startswith('---'): return d
+        k, lst = None, []
+        nested_key, nested_dict = None, {}
+        pending = False
+        for ln in f:
+            if ln.startswith('---'): break
+            s = ln.lstrip()
+            indent = len(ln) - len(s)
+            s = s.rstrip()
+            if not s:
+                # Blank lines close open blocks, but only if more frontmatter follows
+                pending = pending or not (len(ln.rstrip('\n')) >= 2 and nested_key)
+                continue
+            nested = indent >= 2 and nested_key
+            if pending or not nested:
+                # Top-level line - flush previous
+                if nested_key and nested_dict:
+                    d[nested_key] = nested_dict
+                    nested_dict, nested_key = {}, None
+                if k and lst:
+                    d[k] = ', '.join(lst)
+                    lst, k = [], None
+                pending = False
+                nested = indent >= 2 and nested_key
+            if nested:
+                # Inside a nested block
+                if s[:2] == '- ':
+                    lst.append(s[2:].lstrip())
+                else:
+                    nk, sep, nv = s.partition(':')
+                    if sep:
+                        nv = nv.strip().strip('"').strip("'")
+                        if nv: nested_dict[nk.rstrip()] = nv
+                continue
+            if s[:2] == '- ':
+                if k: lst.append(s[2:].lstrip())
+                continue
+            kk, sep, v = s.partition(':')
+            if not sep: continue
+            kk = kk.rstrip()
+            v = v.strip().strip('"').strip("'")
+            if v:
+                d[kk] = v
+                k = None
+            else:
+                # Could be start of nested block or list
+                nested_key, nested_dict = kk, {}
+                k, lst = kk, []
+        else:
+            return {}  # no closing '---'
+        # Flush final
+        if nested_key and nested_dict:
+            d[nested_key] = nested_dict
+        elif k and lst:
+            d[k] = ', '.join(lst)
+    return d
+
+_cache, _seen = {}, set()
+_io_stats = {}  # per note kind: files looked at, parsed, bytes parsed, cache hits
+_stale = {}  # vault input ('helis', 'schedule', ...) -> notes this run couldn't read
+_cache_lock = threading.RLock()
+_io_pool = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix='vault-io')
+# Reads run here so a stuck one only ties up a reader, never a loader; see read_note
+_read_pool = ThreadPoolExecutor(IO_WORKERS, thread_name_prefix='vault-read')
+_read_deadline = None  # monotonic end of the current run's READ_BUDGET_S; None outside a run
+
+class Unavailable(Exception):
+    """A vault note that can't be read right now: in iCloud only, too slow, or failing"""
+
+def evicted(fp, st):
+    """True if fp's content is only in iCloud: a .name.icloud stub in its place, or a dataless file"""
+    return bool(getattr(st, 'st_flags', 0) & SF_DATALESS) or not os.path.exists(fp)
+
+def icloud_stub(fp):
+    return os.path.join(os.path.dirname(fp), f".{os.path.basename(fp)}.icloud")
+
+def note_stat(fp):
+    """Stat of fp, or of the iCloud stub standing in for it"""
+    try: return os.stat(fp)
+    except FileNotFoundError:
+        if not os.path.lexists(icloud_stub(fp)): raise  # no note at all
+        return os.stat(icloud_stub(fp))
+
+def read_note(fp, st, parse):
+    """parse(fp) within the read deadline, without touching notes that are only in iCloud.
+
+    Raises Unavailable instead of blocking: for evicted notes (and asks iCloud
+    to fetch them for the next run), reads slower than READ_TIMEOUT_S or the
+    run's remaining READ_BUDGET_S (during a generate run), and read errors.
+    """
+    if evicted(fp, st):
+        if shutil.which('brctl'): subprocess.Popen(['brctl', 'download', fp], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        raise Unavailable("in iCloud only")
+    job = _read_pool.submit(parse, fp)
+    wait = READ_TIMEOUT_S if _read_deadline is None else max(0.0, min(READ_TIMEOUT_S, _read_deadline - time.monotonic()))
+    try: return job.result(timeout=wait)
+    except ReadTimeout: raise Unavailable("read timed out") from None
+    except (OSError, UnicodeDecodeError) as e: raise Unavailable(str(e)) from None
+
+def mark_stale(dep, fp, why):
+    with _cache_lock:
+        if os.path.basename(fp) in _stale.setdefault(dep, []): return
+        _stale[dep].append(os.path.basename(fp))
+    say(f"⚠️ Could not read {os.path.basename(fp)}: {why}")
+
+def say(msg):
+    # One write per line, so loader messages from different threads don't interleave
+    sys.stdout.write(msg + '\n')
+
+def tally(kind, parsed=0, nbytes=0, hits=0):
+    with _cache_lock:
+        s = _io_stats.setdefault(kind, {'files': 0, 'parsed': 0, 'bytes': 0, 'hits': 0})
+        s['files'] += parsed + hits; s['parsed'] += parsed; s['bytes'] += nbytes; s['hits'] += hits
+
+def pmap(fn, items):
+    """fn over items on the I/O pool, results in input order"""
+    return list(_io_pool.map(fn, items))
+
+def load_cache():
+    global _cache, _read_deadline
+    _seen.clear()
+    _io_stats.clear()
+    _stale.clear()
+    _read_deadline = time.monotonic() + READ_BUDGET_S
+    if _cache: return  # already warm (watch mode)
+    try:
+        c = json.load(open(CACHE_FILE))
+        _cache = c['files'] if c.get('version') == CACHE_VERSION else {}
+    except: _cache = {}
+
+def save_cache():
+    global _read_deadline
+    _read_deadline = None  # the run's read budget ends with it
+    # Drop entries for notes that were deleted or moved since the last run (evicted ones are kept)
+    for k in [k for k in _cache if k not in _seen and not os.path.exists(k) and not os.path.exists(icloud_stub(k))]:
+        del _cache[k]
+    try: write_json(CACHE_FILE, {'version': CACHE_VERSION, 'files': _cache})
+    except OSError as e: print(f"⚠️ Could not save parse cache: {e}")
+    print(f"♻️ Parse cache: {sum(s['hits'] for s in _io_stats.values())} reused, {sum(s['parsed'] for s in _io_stats.values())} parsed")
+
+def write_json(fp, obj):
+    """Atomically replace fp with obj as compact JSON"""
+    os.makedirs(os.path.dirname(fp), exist_ok=True)
+    tmp = fp + '.tmp'
+    with open(tmp, 'w') as f: json.dump(obj, f, separators=(',', ':'))
+    os.replace(tmp, fp)
+
+def scan(d, prefix='', suffix='.md', dirs=False):
+    """Single os.scandir pass over d; returns sorted (path, stat) pairs, with iCloud stubs standing in for their notes"""
+    out = []
+    try:
+        with os.scandir(d) as it:
+            for e in it:
+                # iCloud leaves an evicted note as a '.<name>.icloud' stub; list it under the note's own path
+                n = e.name[1:-7] if not dirs and e.name.startswith('.') and e.name.endswith('.icloud') else e.name
+                if n.startswith('.') or not n.startswith(prefix) or not n.endswith(suffix): continue
+                try:
+                    if e.is_dir() != dirs: continue
+                    out.append((os.path.join(d, n), e.stat()))
+                except OSError: pass
+    except OSError: pass
+    out.sort()
+    return out
+
+def cached(fp, st, kind, parse, dep):
+    """Return parse(fp), reusing the cached result while the file is unchanged.
+
+    If fp can't be read (see read_note), the last good result is returned and
+    dep marked stale; None if there never was one.
+    """
+    key = [st.st_mtime_ns, st.st_size, st.st_ino]
+    with _cache_lock:
+        _seen.add(fp)
+        ent = _cache.get(fp)
+        if ent and ent['key'] == key and kind in ent:
+            tally(kind, hits=1)
+            return ent[kind]
+    try: v = read_note(fp, st, parse)
+    except Unavailable as e:
+        mark_stale(dep, fp, e)
+        return ent.get(kind) if ent else None
+    with _cache_lock:
+        ent = _cache.get(fp)
+        if not ent or ent['key'] != key: ent = _cache[fp] = {'key': key}
+        ent[kind] = v
+        tally(kind, parsed=1, nbytes=st.st_size)
+    return v
+
+def load_helis(d=None):
+    h = []
+    files = scan(d or HELIS_DIR, prefix='HZHC')
+    for (f, _), d in zip(files, pmap(lambda e: cached(*e, 'fm', parse_fm, 'helis'), files)):
+        if d is None: continue  # never read, nothing to fall back on
+        raw_status = d.get('status', 'Parked')
+        h.append({
+            'reg': d.get('registration', os.path.basename(f).replace('.md','')),
+            'loc': d.get('location','UNK'),
+            'status': pin_status(raw_status),
+            'fullStatus': raw_status,
+            'mission': d.get('current_mission',''),
+            'note': d.get('notes', d.get('note','')),
+            'ert': d.get('ert',''),
+            'total_fh': d.get('total_fh',''),
+            '150hr_rem_fh': d.get('150hr_rem_fh',''),
+            '12mo_due': d.get('12mo_due',''),
+            'mel_ref': d.get('mel_ref',''),
+            'mel_expiry': d.get('mel_expiry',''),
+            'mel_rem_days': d.get('mel_rem_days',''),
+        })
+    say(f"✅ Loaded {len(h)} helicopters")
+    return h
+
+def pin_status(raw_status):
+    """Map pin colour for a note's free-text status: 'maint' or 'parked'"""
+    st = raw_status.lower()
+    if 'serviceable' in st: return 'parked'
+    if 'maint' in st or 'aog' in st: return 'maint'
+    return 'parked'
+
+def is_h125(reg_field):
+    """Check if registration is in HC50-HC70 range (H125 only)"""
+    # Extract number from reg like HC55, HZHC55, etc.
+    m = re.search(r'HC(\d+)', reg_field)
+    if m:
+        num = int(m.group(1))
+        return 50 <= num <= 70
+    return False
+
+_schedule = (None, None)
+
+def load_schedule(fp=None):
+    """Parse Flights Schedule.md in one streaming pass into a date-sorted index.
+
+    Returns (dates, rows, sections): rows are (date, seq, section_no, cells)
+    sorted by date then file order, dates is the parallel key list for bisect
+    and sections holds the '## ' header titles by section_no. The index is
+    reused while the file's stat key is unchanged, and in its place while the
+    file can't be read (Unavailable if there is none). No file is an empty index.
+    """
+    global _schedule
+    fp = fp or FLIGHTS_FILE
+    try:
+        st = note_stat(fp)
+        key = (fp, st.st_mtime_ns, st.st_size, st.st_ino)
+        with _cache_lock:  # a run asks several times; only its first look counts towards the hit tally
+            first = fp not in _seen
+            _seen.add(fp)
+        if _schedule[0] == key:
+            if first: tally('schedule', hits=1)
+            return _schedule[1]
+        idx = read_note(fp, st, parse_schedule)
+    except FileNotFoundError: return [], [], []  # no schedule note: nothing scheduled
+    except (OSError, Unavailable) as e:
+        mark_stale('schedule', fp, e)
+        if _schedule[0] and _schedule[0][0] == fp: return _schedule[1]
+        raise
+    tally('schedule', parsed=1, nbytes=st.st_size)
+    _schedule = (key, idx)
+    return idx
+
+def parse_schedule(fp):
+    rows, sections = [], []
+    with open(fp) as f:
+        for ln in f:
+            if ln.startswith('## '):
+                sections.append(ln[3:].strip())
+            elif '|' in ln and not ln.startswith('#'):
+                p = [x.strip() for x in ln.split('|')]
+                if len(p) >= 4: rows.append((p[0], len(rows), len(sections) - 1, p))
+    rows.sort(key=lambda r: (r[0], r[1]))
+    return [r[0] for r in rows], rows, sections
+
+def flights_on(ts, fp=None):
+    dates, rows, _ = load_schedule(fp)
+    return rows[bisect.bisect_left(dates, ts):bisect.bisect_right(dates, ts)]
+
+def flights_from(ts, fp=None):
+    """Rows dated ts or later, back in file order"""
+    dates, rows, _ = load_schedule(fp)
+    return sorted(rows[bisect.bisect_left(dates, ts):], key=lambda r: r[1])
+
+def load_flights(today=None, fp=None):
+    fl, fy, fr = [], {}, {}  # fr = flight routes
+    try: today_rows = flights_on((today or TODAY).strftime("%Y-%m-%d"), fp)
+    except Unavailable: today_rows = []  # schedule unreadable (and marked stale): show nobody flying
+    for *_, p in today_rows:
+        if not is_h125(p[1]):
+            continue  # Skip non-H125 aircraft
+        r = 'HZHC' + p[1].replace('HC','') if not p[1].startswith('HZ') else p[1]
+        mission = p[2]
+        fl.append({'reg': r, 'mission': mission, 'pilot': p[3]})
+        fy[r] = p[3]
+        # Parse route for repositions (dest is 4-letter ICAO code)
+        if 'reposition' in mission.lower() and ' - ' in mission:
+            dest = mission.split(' - ')[-1].strip()
+            if len(dest) == 4 and dest.isupper():  # ICAO code
+                fr[r] = {'mission': mission, 'dest': dest}
+    say(f"✅ Loaded {len(fl)} flights")
+    return fl, fy, fr
+
+PILOT_FIELDS = re.compile(r'^[^:\n]*?(Medical Certificate Date|30 Mins REMS|Last Competency Check):(.*)$', re.M)
+
+def add_months(d, n):
+    y, m = divmod(d.year * 12 + d.month - 1 + n, 12)
+    return d.replace(year=y, month=m + 1, day=min(d.day, calendar.monthrange(y, m + 1)[1]))
+
+def parse_pilot(pf):
+    """Raw currency dates and the expiry each one implies, as ISO dates.
+
+    Competency and medical lapse 12 months after the check; REMS 30 stays
+    valid through the 6th calendar month counting the flight month, so its
+    expiry is the last day of that month.
+    """
+    f = {k: v.strip() for k, v in PILOT_FIELDS.findall(open(pf).read())}
+    r = {'medical': f.get('Medical Certificate Date', ''), 'rems': f.get('30 Mins REMS', ''), 'competency': f.get('Last Competency Check', '')}
+    exp = {}
+    for k, fmt, months in (('competency', "%Y-%m-%d", 12), ('medical', "%Y-%m-%d", 12), ('rems', "%Y-%m", 6)):
+        try: d = datetime.strptime(r[k], fmt)
+        except: continue
+        exp[k] = (add_months(d, months) - timedelta(days=1) if k == 'rems' else add_months(d, months)).strftime("%Y-%m-%d")
+    return {**r, 'expires': exp}
+
+def short_name(nm):
+    # "Lisa Ross" -> "Lisa R"
+    p = nm.split()
+    return f"{p[0]} {p[-1][0]}" if len(p) > 1 else nm
+
+def load_pilot(pd):
+    nm = os.path.basename(pd)
+    pf = os.path.join(pd, f"{nm}.md")
+    try: r = cached(pf, note_stat(pf), 'pilot', parse_pilot, 'pilots')
+    except OSError: return None
+    return r and {'name': nm, 'short': short_name(nm), **r}
+
+def load_currency(d=None):
+    pds = [pd for pd, _ in scan(d or PILOTS_DIR, suffix='', dirs=True)]
+    c = [r for r in pmap(load_pilot, pds) if r]
+    say(f"✅ Loaded {len(c)} currency records")
+    return c
+
+def currency_index(curr):
+    """Every pilot expiry as a date-sorted list of (date, kind, name, short)"""
+    return sorted((d, k, c['name'], c['short']) for c in curr for k, d in c['expires'].items())
+
+def expiring(idx, until, since=''):
+    """Index entries expiring on or after since and before until (ISO dates)"""
+    return idx[bisect.bisect_left(idx, (since,)):bisect.bisect_left(idx, (until,))]
+
+def mission_record(fp):
+    d = parse_fm(fp)
+    t = d.get('title', os.path.basename(fp).replace('.md',''))
+    # Format helicopter roles
+    helis = d.get('helicopters', d.get('Helicopter', ''))
+    if isinstance(helis, dict):
+        # New role-based format: {Film: HZHC55, EMS 1: HZHC57, ...}
+        heli_str = ' | '.join(f"{reg.replace('HZHC','HC')} ({role})" for role, reg in helis.items())
+    elif isinstance(helis, str):
+        heli_str = helis.replace('HZHC','HC') if helis else 'TBD'
+    else:
+        heli_str = 'TBD'
+    start = d.get('date','')
+    return {'title': t, 'date': start, 'endDate': d.get('endDate', start), 'status': d.get('status','pending'),
+            'helicopters': heli_str, 'pilots': d.get('Pilots', '')}
+
+_mindex = {}  # missions folder -> its index
+_mindex_changed = False  # MISSIONS_DIR's index differs from MISSIONS_INDEX
+
+def refresh_mission_index(d=None):
+    """Bring the index of missions folder d up to date, re-parsing only notes whose stat key changed.
+
+    The index holds one record per mission note plus 'order' (dated paths
+    sorted by start), 'starts' (the parallel bisect keys), 'span' (longest
+    mission in days, so overlap queries can bisect on start alone) and
+    'undated' (paths with no date, shown as TBD). It is kept in memory;
+    regenerate() saves the vault's own with save_mission_index().
+    """
+    global _mindex_changed
+    d = d or MISSIONS_DIR
+    idx = _mindex.get(d)
+    if idx is None:
+        try:
+            if d != MISSIONS_DIR: raise ValueError  # only the vault's index is kept on disk
+            idx = json.load(open(MISSIONS_INDEX))
+            if idx.get('version') != MISSIONS_INDEX_VERSION: raise ValueError
+        except: idx = {'version': MISSIONS_INDEX_VERSION, 'files': {}, 'order': [], 'starts': [], 'span': 0, 'undated': []}
+        _mindex[d] = idx
+    files = idx['files']
+    found = {fp: [st.st_mtime_ns, st.st_size, st.st_ino, st] for fp, st in scan(d) + scan(f"{d}/Past Missions")}
+    stale = [fp for fp, key in found.items() if fp not in files or files[fp]['key'] != key[:3]]
+    gone = [fp for fp in files if fp not in found]
+    tally('mission', parsed=len(stale), nbytes=sum(found[fp][1] for fp in stale), hits=len(found) - len(stale))
+    if not stale and not gone: return idx
+    def read(fp):
+        try: return read_note(fp, found[fp][3], mission_record)
+        except Unavailable as e: mark_stale('missions', fp, e)
+    for fp, rec in zip(stale, pmap(read, stale)):
+        if rec: files[fp] = {'key': found[fp][:3], 'm': rec}  # unreadable: keep the old record, retry next run
+    for fp in gone: del files[fp]
+    dated = sorted((e['m']['date'], fp) for fp, e in files.items() if e['m']['date'])
+    span = 0
+    for start, fp in dated:
+        try: span = max(span, (datetime.strptime(files[fp]['m']['endDate'], "%Y-%m-%d") - datetime.strptime(start, "%Y-%m-%d")).days)
+        except ValueError: pass
+    idx.update(order=[fp for _, fp in dated], starts=[start for start, _ in dated], span=span,
+               undated=sorted(fp for fp, e in files.items() if not e['m']['date']))
+    if d == MISSIONS_DIR: _mindex_changed = True
+    say(f"🗂️ Missions index: {len(stale)} updated, {len(gone)} removed")
+    return idx
+
+def save_mission_index():
+    """Write MISSIONS_DIR's index to MISSIONS_INDEX if it changed"""
+    global _mindex_changed
+    if not _mindex_changed or MISSIONS_DIR not in _mindex: return
+    try:
+        write_json(MISSIONS_INDEX, _mindex[MISSIONS_DIR])
+        _mindex_changed = False
+    except OSError as e: say(f"⚠️ Could not save missions index: {e}")
+
+def missions_between(lo, hi, d=None):
+    """Mission records in missions folder d overlapping lo..hi (YYYY-MM-DD, inclusive), plus undated ones"""
+    idx = refresh_mission_index(d)
+    files, starts = idx['files'], idx['starts']
+    first = (datetime.strptime(lo, "%Y-%m-%d") - timedelta(days=idx['span'])).strftime("%Y-%m-%d")
+    out = []
+    for fp in idx['order'][bisect.bisect_left(starts, first):bisect.bisect_right(starts, hi)]:
+        m = files[fp]['m']
+        if (m['endDate'] or m['date']) >= lo: out.append(dict(m))
+    return out + [dict(files[fp]['m']) for fp in idx['undated']]
+
+def timeline_window(today=None):
+    """First and last day of the rolling timeline window"""
+    today = today or TODAY
+    def month(n):
+        y, m = divmod(today.year * 12 + today.month - 1 + n, 12)
+        return datetime(y, m + 1, 1)
+    return month(-TIMELINE_MONTHS_BACK), month(TIMELINE_MONTHS_AHEAD + 1) - timedelta(days=1)
+
+def load_missions(lo=None, hi=None, today=None, d=None):
+    m = []
+    ts = (today or TODAY).strftime("%Y-%m-%d")
+    mn, mx = timeline_window(today)
+    for r in missions_between(lo or mn.strftime("%Y-%m-%d"), hi or mx.strftime("%Y-%m-%d"), d):
+        # Auto-determine status from dates
+        # past = ended before today (grey)
+        # active = happening now (green)
+        # pending = future, unconfirmed (red)
+        # confirmed = future, confirmed (blue)
+        raw_status, start, end = r['status'], r['date'], r['endDate']
+        if raw_status in ('past', 'complete'):
+            auto_status = raw_status
+        elif start:
+            if end and end < ts:
+                auto_status = 'past'
+            elif start <= ts and (not end or end >= ts):
+                auto_status = 'active'
+            else:
+                # Future mission — use frontmatter status
+                auto_status = raw_status if raw_status in ('confirmed', 'pending') else 'pending'
+        else:
+            auto_status = raw_status
+        r['status'] = auto_status
+        m.append(r)
+    m.sort(key=lambda x: x['date'] if x['date'] else 'zzzz')
+    say(f"✅ Loaded {len(m)} missions")
+    return m
+
+def build_fleet(helis, fy, fr):
+    fleet = []
+    cnt = {'parked':0, 'flying':0, 'maint':0}
+    for h in helis:
+        st = 'flying' if h['reg'] in fy else h['status']
+        cnt[st] = cnt.get(st,0) + 1
+        e = {'reg': h['reg'], 'loc': h['loc'], 'status': st, 'fullStatus': h['fullStatus']}
+        if h['note']: e['note'] = h['note']
+        if h['mission']: e['mission'] = h['mission']
+        if h['ert']: e['ert'] = h['ert']
+        if h['150hr_rem_fh']: e['remFH'] = h['150hr_rem_fh']
+        if h['mel_ref']: e['melRef'] = h['mel_ref']
+        if h['mel_expiry']: e['melExpiry'] = h['mel_expiry']
+        if h['mel_rem_days']: e['melRemDays'] = h['mel_rem_days']
+        if h['reg'] in fy: e['pilot'] = fy[h['reg']]
+        # Add route info for flying helicopters
+        if h['reg'] in fr:
+            e['route'] = f"{h['loc']} → {fr[h['reg']]['dest']}"
+        fleet.append(e)
+    print(f"✅ Fleet: {cnt['parked']} serviceable, {cnt['flying']} flying, {cnt['maint']} maint")
+    return map_layout(fleet)
+
+def map_layout(fleet):
+    """{bases, bounds, helis}: fleet with each aircraft's map position ('ll') and route line ('path')"""
+    at = {}
+    for h in fleet:
+        if h['loc'] in BASES: at.setdefault(h['loc'], []).append(h)
+    dlat, dlng = BASE_GRID_STEP
+    for loc, g in at.items():
+        lat, lng, _ = BASES[loc]
+        cols = max(min(len(g), BASE_GRID_COLS), math.ceil(math.sqrt(len(g))))
+        rows = math.ceil(len(g) / cols)
+        for i, h in enumerate(g):
+            r, c = divmod(i, cols)
+            h['ll'] = [round(lat + (r - (rows - 1) / 2) * dlat, 4), round(lng + (c - (cols - 1) / 2) * dlng, 4)]
+    for h in fleet:
+        # Repositioning flights get a line from base to base
+        a, _, b = h.get('route', '').partition(' → ')
+        if h['status'] == 'flying' and a in BASES and b in BASES and a != b: h['path'] = [BASES[a][:2], BASES[b][:2]]
+    pts = [BASES[loc][:2] for loc in at]
+    bounds = None
+    if pts:
+        (s, n), (w, e) = [(min(v), max(v)) for v in zip(*pts)]
+        ps, pw = (n - s) * MAP_PAD, (e - w) * MAP_PAD
+        bounds = [[round(s - ps, 4), round(w - pw, 4)], [round(n + ps, 4), round(e + pw, 4)]]
+    return {'bases': {k: {'lat': lat, 'lng': lng, 'name': nm} for k, (lat, lng, nm) in BASES.items()}, 'bounds': bounds, 'helis': fleet}
+
+def build_flights(today=None, fp=None):
+    """Remaining scheduled H125 flights in schedule file fp, grouped under their '## ' headers"""
+    groups = []
+    ts = (today or TODAY).strftime("%Y-%m-%d")
+    sections = load_schedule(fp)[2]
+    last_sec = None
+    for d, _, sec, p in flights_from(ts, fp):
+        # Skip non-H125 aircraft
+        if not is_h125(p[1]):
+            continue
+        # Section header goes in once, above its first remaining flight
+        if sec != last_sec or not groups:
+            groups.append({'title': sections[sec] if sec >= 0 else '', 'rows': []})
+            last_sec = sec
+        r = p[1].replace('HZHC','HC') if 'HZ' in p[1] else p[1]
+        row = {'reg': r, 'info': p[2], 'pilot': p[3]}
+        if d == ts: row['today'] = 1
+        groups[-1]['rows'].append(row)
+    return {'period': report_period(today, fp), 'groups': groups}
+
+def build_currency(curr, today=None):
+    """Alert groups for the currency panel: [{title, alerts: [{level, text}]}]"""
+    idx = currency_index(curr)
+    today = today or TODAY
+    this_mo = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    iso = lambda d: d.strftime("%Y-%m-%d")
+    today, mo, mo_end, ahead_end = iso(today), iso(this_mo), iso(add_months(this_mo, 1)), iso(add_months(this_mo, 1 + CURRENCY_AHEAD_MONTHS))
+    mon = lambda d: datetime.strptime(d, "%Y-%m-%d").strftime("%b %Y")
+    L = []
+    
+    # Competency - 12 months from last check: due this month, or in the months ahead
+    comp = [(d, n) for d, k, _, n in expiring(idx, ahead_end, mo) if k == 'competency']
+    L.append({'title': 'Competency Checks', 'alerts': [
+        {'level': 'warn', 'text': f"⚠️ {n} - due {mon(d)}"} if d < mo_end else {'level': 'info', 'text': f"📅 {n} - due {mon(d)}"}
+        for d, n in comp] or [{'level': 'ok', 'text': "✅ Nobody due this or next month" if CURRENCY_AHEAD_MONTHS == 1 else
+                               f"✅ Nobody due in the next {CURRENCY_AHEAD_MONTHS + 1} months"}]})
+    
+    # REMS 30 - expired, or running out this month
+    rems = [(d, n) for d, k, _, n in expiring(idx, mo_end) if k == 'rems']
+    if rems:
+        L.append({'title': '30-Min REMS (6 month validity)', 'alerts': [
+            {'level': 'danger', 'text': f"🔴 {n} - expired {mon(d)}"} if d < today else {'level': 'warn', 'text': f"⚠️ {n} - expires {mon(d)}"}
+            for d, n in rems]})
+    
+    # Medical - 12 months from check date: overdue before this month, due this month
+    med = [(d, n) for d, k, _, n in expiring(idx, mo_end) if k == 'medical']
+    if med:
+        L.append({'title': 'Medical Certificate (12 month validity)', 'alerts': [
+            {'level': 'danger', 'text': f"🔴 {n} - overdue since {mon(d)}"} if d < mo else {'level': 'warn', 'text': f"⚠️ {n} - due {mon(d)}"}
+            for d, n in med]})
+    
+    return L
+
+def pack_lanes(evs, max_lanes=TIMELINE_LANES, grow=TIMELINE_GROW_LANES, pad=LANE_PAD):
+    """Interval-partition evs (dicts with 's'/'e' datetimes) into lanes in O(n log n).
+
+    Each event goes into the lowest-numbered lane whose last mission ended
+    more than pad before it starts. When all max_lanes are busy a new lane is
+    opened if grow is set; otherwise the event shares the lane that frees up
+    first and is counted as overflow. Returns (lanes, overflow).
+    """
+    lanes, overflow = [], 0
+    busy, free = [], []  # heaps of (last end + pad, lane) and of lane numbers
+    for ev in sorted(evs, key=lambda x: x['s']):
+        while busy and busy[0][0] < ev['s']:
+            heapq.heappush(free, heapq.heappop(busy)[1])
+        end = ev['e'] + pad
+        if free:
+            i = heapq.heappop(free)
+        elif len(lanes) < max_lanes or grow:
+            i = len(lanes)
+            lanes.append([])
+        else:
+            prev, i = heapq.heappop(busy)
+            end = max(end, prev)
+            overflow += 1
+        lanes[i].append(ev)
+        heapq.heappush(busy, (end, i))
+    return lanes, overflow
+
+def build_timeline(missions, today=None):
+    tbd = [m for m in missions if not m['date']]
+    dated = [m for m in missions if m['date']]
+    if not dated: return None
+    
+    def pdt(d):
+        try: return datetime.strptime(d, "%Y-%m-%d")
+        except: return None
+    
+    for m in dated: m['s'], m['e'] = pdt(m['date']), pdt(m['endDate']) or pdt(m['date'])
+    dated = [m for m in dated if m['s']]
+    dated.sort(key=lambda x: x['s'])
+    
+    mn, mx = timeline_window(today)
+    dated = [m for m in dated if m['e'] >= mn and m['s'] <= mx]
+    
+    def fdt(s,e):
+        if s==e: return s.strftime("%-d %b")
+        elif s.year!=e.year: return f"{s.strftime('%-d %b %Y')} - {e.strftime('%-d %b %Y')}"
+        elif s.month==e.month: return f"{s.day}-{e.strftime('%-d %b')}"
+        return f"{s.strftime('%-d %b')} - {e.strftime('%-d %b')}"
+    
+    lanes, overflow = pack_lanes(dated)
+    if overflow: say(f"⚠️ {overflow} missions overlap others: more than {TIMELINE_LANES} timeline lanes needed")
+    
+    # Compact events: day offsets into the window, clamped to it. The page lays
+    # them out (even lanes above the axis, odd below) and only draws what's in view
+    def ev(m, lane):
+        s, e = max(m['s'], mn), min(m['e'], mx)
+        return {'lane': lane, 'start': (s-mn).days, 'days': (e-s).days + 1, 'name': m['title'], 'status': m['status'],
+                'dates': fdt(m['s'],m['e']), 'aircraft': m.get('helicopters') or 'TBD', 'pilots': m.get('pilots') or 'TBD'}
+    
+    return {
+        'from': mn.strftime("%Y-%m-%d"), 'to': mx.strftime("%Y-%m-%d"), 'lanes': len(lanes),
+        'tbd': [{'name': m['title'], 'aircraft': m.get('helicopters','TBD'), 'pilots': m.get('pilots','TBD')} for m in tbd],
+        'events': [ev(m, i) for i, lane in enumerate(lanes) for m in lane],
+    }
+
+def report_period(today=None, fp=None):
+    """First through last remaining scheduled flight date, e.g. '05 Feb – 08 Feb 2026'"""
+    ds = []
+    for r in flights_from((today or TODAY).strftime("%Y-%m-%d"), fp):
+        try: ds.append(datetime.strptime(r[0], "%Y-%m-%d"))
+        except ValueError: pass  # TBD, or not a real date
+    if not ds: return 'No flights scheduled'
+    return f"{min(ds).strftime('%d %b')} – {max(ds).strftime('%d %b %Y')}"
+
+# Repeated strings in data.json are stored once in 'strings' and referenced by index
+DICT_KEYS = ('reg', 'loc', 'status', 'fullStatus', 'pilot', 'level', 'aircraft', 'pilots')
+
+def encode_bundle(sections, stale=None):
+    """Versioned, dictionary-encoded and content-hashed data.json payload.
+
+    stale maps sections built from last-known-good notes to those notes' names.
+    """
+    ix = {}
+    def enc(o):
+        if isinstance(o, dict):
+            return {k: (ix.setdefault(v, len(ix)) if k in DICT_KEYS and isinstance(v, str) else enc(v)) for k, v in o.items()}
+        if isinstance(o, list): return [enc(v) for v in o]
+        return o
+    body = enc({n: sections.get(n) for n in SECTIONS})
+    payload = {'version': DATA_VERSION, 'strings': list(ix), 'stale': stale or {}, **body}
+    raw = json.dumps(payload, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
+    payload['hash'] = hashlib.sha256(raw.encode()).hexdigest()[:16]
+    return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+
+def write_stamp(changed):
+    """Record this run in STAMP_FILE; 'updated' only moves when the data changed"""
+    try: prev = json.load(open(STAMP_FILE))
+    except: prev = {}
+    now = {'at': TODAY.isoformat(), 'text': TODAY.strftime("%-d %b %Y %H:%M"), 'date': TODAY.strftime("%-d %b %Y")}
+    st = {'updated': now if changed or 'updated' not in prev else prev['updated'], 'checked': now}
+    write_if_changed(STAMP_FILE, json.dumps(st, indent=1) + '\n')
+    return st
+
+def write_if_changed(fp, text):
+    """Atomically replace fp with text (or bytes) unless it already holds exactly that; returns True if written"""
+    data = text.encode() if isinstance(text, str) else text
+    try:
+        with open(fp, 'rb') as f:
+            if f.read() == data: return False
+    except FileNotFoundError: pass
+    tmp = f"{fp}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f: f.write(data)
+    os.replace(tmp, fp)
+    return True
+
+def vault_inputs(dep):
+    """(path, stat) of every vault file behind one of the SECTION_INPUTS"""
+    if dep == 'helis': return scan(HELIS_DIR, prefix='HZHC')
+    if dep == 'missions': return scan(MISSIONS_DIR) + scan(f"{MISSIONS_DIR}/Past Missions")
+    fps = [FLIGHTS_FILE] if dep == 'schedule' else [f"{pd}/{os.path.basename(pd)}.md" for pd, _ in scan(PILOTS_DIR, suffix='', dirs=True)]
+    out = []
+    for fp in fps:
+        try: out.append((fp, note_stat(fp)))
+        except OSError: pass
+    return out
+
+CODE_KEY = os.stat(__file__).st_mtime_ns  # editing the generator invalidates every section
+
+def section_hash(sec):
+    """Fingerprint of everything sec is built from: its input files' stat keys, the date and the code"""
+    h = hashlib.sha256(f"{DATA_VERSION}|{CODE_KEY}|{TODAY.date()}\n".encode())
+    for dep in SECTION_INPUTS[sec]:
+        for fp, st in vault_inputs(dep): h.update(f"{fp}|{st.st_mtime_ns}|{st.st_size}|{st.st_ino}\n".encode())
+    return h.hexdigest()[:16]
+
+def timed(fn, *a):
+    t = time.perf_counter()
+    return fn(*a), time.perf_counter() - t
+
+METRICS = False  # set by --metrics
+BUNDLE = False  # set by --bundle
+_build_lock = threading.Lock()  # one rebuild at a time across --serve requests, --watch and --schedule; taken by run_lock
+_hashes = {}  # section_hash of each section in the current build
+
+def log_metrics(run):
+    """Append run to METRICS_LOG, flagging it if it's well over the recent median"""
+    try:
+        with open(METRICS_LOG, 'rb') as f:
+            f.seek(0, 2); f.seek(max(0, f.tell() - 2048 * SLOW_WINDOW))  # records run well under 2 KB
+            tail = f.read().decode(errors='ignore').splitlines()[-SLOW_WINDOW:]
+    except OSError: tail = []
+    past = []
+    for ln in tail:
+        try: past.append(json.loads(ln)['ms'])
+        except (ValueError, KeyError): pass  # partial first line, or not a run record
+    past.sort()
+    med = past[len(past) // 2] if past else None
+    run['median_ms'], run['slow'] = med, bool(med and len(past) >= 5 and run['ms'] > SLOW_FACTOR * med)
+    if run['slow']: print(f"🐢 Slow run: {run['ms']:.0f}ms vs {med:.0f}ms median of the last {len(past)}")
+    try:
+        os.makedirs(os.path.dirname(METRICS_LOG), exist_ok=True)
+        with open(METRICS_LOG, 'a') as f: f.write(json.dumps(run, separators=(',', ':')) + '\n')
+    except OSError as e: print(f"⚠️ Could not write metrics: {e}")
+
+def regenerate(sections=SECTIONS, force=False):
+    """Rebuild those of the given sections of DATA_FILE whose inputs changed (all of them with force).
+
+    Each section's last build is kept in SECTIONS_CACHE with the section_hash
+    it was built from, so the rest are re-emitted as they were. Returns True
+    if DATA_FILE changed.
+    """
+    t0 = time.perf_counter()
+    load_cache()
+    try: sc = json.load(open(SECTIONS_CACHE))
+    except: sc = {}
+    f, hashes, stale = sc.get('data', {}), sc.get('hashes', {}), sc.get('stale', {})
+    now = {s: section_hash(s) for s in sections}
+    todo = [s for s in sections if force or s not in f or hashes.get(s) != now[s]]
+    print(f"🧩 Rebuilding {', '.join(todo) or 'nothing'}" + (f" ({', '.join(s for s in sections if s not in todo)} unchanged)" if len(todo) < len(sections) else ''))
+    sections = todo
+    # loader: (needed, fn, note kind it reads, for --metrics)
+    need = {
+        'helis': ('fleet' in sections, load_helis, 'fm'),
+        'flights': ('fleet' in sections, load_flights, 'schedule'),
+        'currency': ('currency' in sections, load_currency, 'pilot'),
+        'missions': ('timeline' in sections, load_missions, 'mission'),
+    }
+    # Loaders are I/O-bound, so run them side by side and report each one's wall time
+    with ThreadPoolExecutor(len(need)) as ex:
+        jobs = {n: ex.submit(timed, fn) for n, (on, fn, _) in need.items() if on}
+    res = {n: j.result() for n, j in jobs.items()}
+    if res: print("⏱️ Loaders: " + ', '.join(f"{n} {res[n][1]*1000:.0f}ms" for n in res) + f" (wall {(time.perf_counter()-t0)*1000:.0f}ms)")
+    stages = {n: {'ms': round(res[n][1] * 1000, 1), **_io_stats.get(need[n][2], {})} for n in res}
+    def stage(name, fn, *a):
+        v, dt = timed(fn, *a)
+        stages[name] = {'ms': round(dt * 1000, 1)}
+        return v
+    if 'fleet' in sections:
+        _, fy, fr = res['flights'][0]
+        f['fleet'] = stage('build_fleet', build_fleet, res['helis'][0], fy, fr)
+    if 'flights' in sections:
+        try: f['flights'] = stage('build_flights', build_flights)
+        except Unavailable: pass
+    if 'currency' in sections: f['currency'] = stage('build_currency', build_currency, res['currency'][0])
+    if 'timeline' in sections: f['timeline'] = stage('build_timeline', build_timeline, res['missions'][0])
+    for s in sections:
+        names = sorted({n for dep in SECTION_INPUTS[s] for n in _stale.get(dep, ())})
+        if names: stale[s] = names
+        else: stale.pop(s, None)
+    for s, names in stale.items(): print(f"⚠️ Stale {s}: last good copy of {', '.join(names)}")
+    # A stale section keeps its old hash on disk so the next run retries it; serve waits for a vault change
+    hashes.update((s, now[s]) for s in sections if s not in stale)
+    _hashes.update(hashes, **{s: now[s] for s in sections})
+    if sections:
+        try: write_json(SECTIONS_CACHE, {'hashes': hashes, 'data': f, 'stale': stale})
+        except OSError as e: print(f"⚠️ Could not save sections cache: {e}")
+    bundle = stage('encode', encode_bundle, f, stale)
+    changed = stage('write', write_if_changed, DATA_FILE, bundle)
+    if not changed: print("💤 Data unchanged — not rewritten")
+    stamp = write_stamp(changed)
+    if 'fleet' in sections and 'fleet' not in stale and f.get('fleet'):
+        stage('history', record_history, TODAY, f['fleet']['helis'])
+    if BUNDLE: stage('bundle', build_bundle)
+    publish(f, sections, re.search(r'"hash":"(\w+)"}$', bundle).group(1), {**stamp, 'stale': stale})
+    save_cache()
+    save_mission_index()
+    if METRICS:
+        log_metrics({'at': TODAY.isoformat(), 'sections': list(sections), 'ms': round((time.perf_counter() - t0) * 1000, 1),
+                     'changed': changed, 'bytes_out': len(bundle.encode()), 'stages': stages})
+    return changed
+
+def generate(vault_path, html_path, now=None, sections=SECTIONS, force=False):
+    """Rebuild html_path's data.json from the vault at vault_path as of now (default: Riyadh time).
+
+    Safe to call repeatedly from one process: caches stay warm while the paths
+    stay the same. Sections whose inputs haven't changed are reused unless
+    force is set. Returns True if data.json changed.
+    """
+    global TODAY
+    use_paths(vault_path, html_path)
+    TODAY = now or riyadh_now()
+    return regenerate(sections, force)
+
+_history = (None, None)
+
+def load_history():
+    """The history store as {'rows', 'last_day', 'strings', column: array}, up to its last committed row.
+
+    Rows only ever get appended: one per aircraft whenever its state changes,
+    in day order. meta.json is rewritten last, so a run that dies mid-append
+    leaves rows past meta's count that are ignored and later overwritten. Kept
+    in memory while meta.json is unchanged.
+    """
+    global _history
+    mf = os.path.join(HISTORY_DIR, "meta.json")
+    try: st = os.stat(mf)
+    except FileNotFoundError: st = None
+    key = st and (mf, st.st_mtime_ns, st.st_size, st.st_ino)
+    if key and _history[0] == key: return _history[1]
+    meta = json.load(open(mf)) if st else {'version': HISTORY_VERSION, 'rows': 0, 'last_day': None, 'strings': []}
+    if meta['version'] != HISTORY_VERSION: raise ValueError(f"history store is format {meta['version']}, expected {HISTORY_VERSION}")
+    h = {k: meta[k] for k in ('rows', 'last_day', 'strings')}
+    for c, t in HISTORY_COLS:
+        a = h[c] = array.array(t)
+        try:
+            with open(os.path.join(HISTORY_DIR, f"{c}.col"), 'rb') as f: a.frombytes(f.read(h['rows'] * a.itemsize))
+        except FileNotFoundError: pass
+        if len(a) != h['rows']: raise ValueError(f"history column {c} has {len(a)} of {h['rows']} rows")
+    _history = (key, h)
+    return h
+
+def hist_int(v, parse=int):
+    try: return parse(str(v))
+    except ValueError: return -1
+
+def fh_minutes(v):
+    # '123:45' flight hours -> minutes
+    h, _, m = v.partition(':')
+    return int(h) * 60 + int(m or 0)
+
+def record_history(day, helis):
+    """Append the fleet's state on day (a datetime) to the history store; returns the rows added.
+
+    helis are build_fleet() entries. Only aircraft whose state differs from
+    their last row get one, plus a row with an empty status for any that
+    left the fleet, so an unchanged day costs nothing but the meta.json rewrite.
+    """
+    try: h = load_history()
+    except (OSError, ValueError) as e: return print(f"⚠️ History not recorded: {e}") or 0
+    d = (day - HISTORY_EPOCH).days
+    if h['last_day'] is not None and d < h['last_day']:
+        return print(f"⚠️ History not recorded: {day:%Y-%m-%d} is before its last day") or 0
+    ids = {v: i for i, v in enumerate(h['strings'])}
+    sid = lambda v: ids.setdefault(v, len(ids))
+    last = {r: tuple(h[c][i] for c, _ in HISTORY_COLS[2:]) for r, i in dict(zip(h['reg'], range(h['rows']))).items()}
+    now = {}
+    for e in helis:
+        flags = FLYING * (e['status'] == 'flying') | MAINT * (pin_status(e['fullStatus']) == 'maint')
+        now[sid(e['reg'])] = (sid(e['fullStatus']), sid(e['loc']), hist_int(e.get('remFH', ''), fh_minutes),
+                              max(-1, min(hist_int(e.get('melRemDays', '')), 32767)), flags)
+    gone = sid('')
+    now.update((r, (gone, s[1], -1, -1, 0)) for r, s in last.items() if r not in now and s[0] != gone)
+    new = [(r, s) for r, s in now.items() if last.get(r) != s]
+    try:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        for j, (c, t) in enumerate(HISTORY_COLS):
+            a = array.array(t, [d] * len(new) if j == 0 else [r for r, _ in new] if j == 1 else [s[j - 2] for _, s in new])
+            with open(os.path.join(HISTORY_DIR, f"{c}.col"), 'ab') as f:
+                f.truncate(h['rows'] * a.itemsize)  # drop rows from a run that never committed
+                a.tofile(f)
+        write_json(os.path.join(HISTORY_DIR, "meta.json"), {'version': HISTORY_VERSION, 'rows': h['rows'] + len(new), 'last_day': d, 'strings': list(ids)})
+    except OSError as e: return print(f"⚠️ History not recorded: {e}") or 0
+    if new: say(f"📈 History: {len(new)} aircraft changed")
+    return len(new)
+
+def fleet_history(lo, hi):
+    """Days in service, in maintenance, flying and at each location per aircraft, lo to hi inclusive.
+
+    Returns ({reg: {'days', 'maint', 'flying', 'locs': {loc: days}}}, first
+    day, last day) over the part of lo..hi the history covers. Each row holds
+    from its day until the aircraft's next row, so on a day with several runs
+    the last one counts, and days without a run carry the previous state.
+    """
+    h = load_history()
+    if not h['rows']: return {}, None, None
+    S, day, reg, status, loc, flags = h['strings'], h['day'], h['reg'], h['status'], h['loc'], h['flags']
+    a, b = max((lo - HISTORY_EPOCH).days, day[0]), min((hi - HISTORY_EPOCH).days, h['last_day']) + 1
+    # Each aircraft's latest row before lo is where it stands on lo
+    k = bisect.bisect_left(day, a)
+    live, spans = dict(zip(reg[:k], range(k))), {}  # spans: days per (reg, status, loc, flags)
+    # Rows are in day order, so nothing after b can overlap
+    for i in range(k, bisect.bisect_left(day, b)):
+        j = live.get(reg[i])
+        if j is not None and day[i] > day[j]:
+            st = (reg[j], status[j], loc[j], flags[j])
+            spans[st] = spans.get(st, 0) + day[i] - max(day[j], a)
+        live[reg[i]] = i
+    for j in live.values():
+        st = (reg[j], status[j], loc[j], flags[j])
+        spans[st] = spans.get(st, 0) + b - max(day[j], a)
+    out = {}
+    for (r, st, l, fl), n in sorted(spans.items()):
+        if n <= 0 or not S[st]: continue  # out of the fleet
+        t = out.setdefault(S[r], {'days': 0, 'maint': 0, 'flying': 0, 'locs': {}})
+        t['days'] += n
+        if fl & MAINT: t['maint'] += n
+        if fl & FLYING: t['flying'] += n
+        t['locs'][S[l]] = t['locs'].get(S[l], 0) + n
+    at = lambda n: HISTORY_EPOCH + timedelta(days=n)
+    return dict(sorted(out.items())), (at(a) if a < b else None), (at(b - 1) if a < b else None)
+
+def history_range(when):
+    """--history RANGE: DAYS back to today, YYYY, YYYY-MM or YYYY-MM-DD, or FROM..TO of those"""
+    if when.isdigit() and len(when) < 4:
+        return TODAY - timedelta(days=int(when) - 1), TODAY
+    def span(v):
+        fmt = {4: "%Y", 7: "%Y-%m", 10: "%Y-%m-%d"}.get(len(v))
+        if not fmt: raise ValueError(v)
+        d = datetime.strptime(v, fmt)
+        if len(v) == 4: return d, d.replace(month=12, day=31)
+        return d, (add_months(d, 1) - timedelta(days=1) if len(v) == 7 else d)
+    lo, _, hi = when.partition('..')
+    return span(lo)[0], span(hi or lo)[1]
+
+def print_history(when):
+    """--history: fleet availability, maintenance days and location dwell over a date range"""
+    lo, hi = history_range(when)
+    t = time.perf_counter()
+    tails, a, b = fleet_history(lo, hi)
+    ms = (time.perf_counter() - t) * 1000
+    if not tails: return print(f"\n📈 No fleet history between {lo:%Y-%m-%d} and {hi:%Y-%m-%d}")
+    days, maint = sum(v['days'] for v in tails.values()), sum(v['maint'] for v in tails.values())
+    print(f"\n📈 Fleet {a:%Y-%m-%d} – {b:%Y-%m-%d} ({(b - a).days + 1} days): {100 * (days - maint) / days:.1f}% available ({ms:.1f}ms)")
+    for r, v in tails.items():
+        locs = ', '.join(f"{l} {n}d" for l, n in sorted(v['locs'].items(), key=lambda x: -x[1]))
+        print(f"   {r:<8}{100 * (v['days'] - v['maint']) / v['days']:>6.1f}%  maint {v['maint']:>3}d  flying {v['flying']:>3}d  {locs}")
+
+def sections_for(fp):
+    """Page sections that depend on the vault file fp"""
+    if fp == FLIGHTS_FILE: return {'fleet', 'flights'}
+    if fp.startswith(HELIS_DIR + '/'): return {'fleet'}
+    if fp.startswith(PILOTS_DIR + '/'): return {'currency'}
+    if fp.startswith(MISSIONS_DIR + '/'): return {'timeline'}
+    return set()
+
+def watch_dirs():
+    ds = [VAULT, HELIS_DIR, PILOTS_DIR, MISSIONS_DIR, f"{MISSIONS_DIR}/Past Missions"]
+    return ds + [pd for pd, _ in scan(PILOTS_DIR, suffix='', dirs=True)]
+
+class Inotify:
+    """Minimal ctypes binding to Linux inotify; raises OSError where unavailable"""
+    MASK = 0x8 | 0x40 | 0x80 | 0x100 | 0x200  # CLOSE_WRITE, MOVED_FROM/TO, CREATE, DELETE
+    IN_ISDIR = 0x40000000
+
+    def __init__(self):
+        import ctypes, ctypes.util
+        if not sys.platform.startswith('linux'): raise OSError("inotify is Linux-only")
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0: raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.wds = {}
+        for d in watch_dirs(): self.add(d)
+
+    def add(self, d):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(d), self.MASK)
+        if wd >= 0: self.wds[wd] = d
+
+    def changes(self, timeout):
+        """Paths changed within timeout seconds (empty list on timeout)"""
+        if not select.select([self.fd], [], [], timeout)[0]: return []
+        try: buf = os.read(self.fd, 65536)
+        except BlockingIOError: return []
+        out, i = [], 0
+        while i + 16 <= len(buf):
+            wd, mask, _, n = struct.unpack_from('iIII', buf, i)
+            name = buf[i+16:i+16+n].rstrip(b'\0').decode(errors='replace')
+            i += 16 + n
+            if wd not in self.wds or not name: continue
+            fp = os.path.join(self.wds[wd], name)
+            if mask & self.IN_ISDIR and self.wds[wd] == PILOTS_DIR: self.add(fp)  # new pilot folder
+            out.append(fp)
+        return out
+
+class Poller:
+    """Portable fallback: diff (mtime, size) snapshots of the watched directories"""
+    def __init__(self):
+        self.snap = self.snapshot()
+
+    def snapshot(self):
+        return {fp: (st.st_mtime_ns, st.st_size) for d in watch_dirs() for fp, st in scan(d)}
+
+    def changes(self, timeout):
+        time.sleep(min(timeout, POLL_INTERVAL_S))
+        new = self.snapshot()
+        out = [fp for fp in new.keys() | self.snap.keys() if new.get(fp) != self.snap.get(fp)]
+        self.snap = new
+        return out
+
+def watch(trigger=None):
+    """--watch: rebuild the sections whose notes change, or with --schedule pass them to trigger(why, sections)"""
+    global TODAY
+    try: w = Inotify(); print("👀 Watching vault (inotify)")
+    except (OSError, AttributeError): w = Poller(); print(f"👀 Watching vault (polling every {POLL_INTERVAL_S:g}s)")
+    day = TODAY.date()
+    while True:
+        pending = set()
+        for fp in w.changes(60): pending |= sections_for(fp)
+        if pending:
+            # Debounce: Obsidian saves come in bursts, so wait for the vault to go quiet
+            first = last = time.monotonic()
+            while time.monotonic() - last < DEBOUNCE_S and time.monotonic() - first < DEBOUNCE_MAX_S:
+                got = w.changes(DEBOUNCE_S)
+                for fp in got: pending |= sections_for(fp)
+                if got: last = time.monotonic()
+        TODAY = riyadh_now()
+        if TODAY.date() != day:
+            day, pending = TODAY.date(), set(SECTIONS)  # date-relative sections roll over at midnight
+        if pending and trigger: trigger('change', pending)
+        elif pending:
+            secs = [s for s in SECTIONS if s in pending]
+            print(f"\n🔄 {TODAY.strftime('%H:%M:%S')} rebuilding {', '.join(secs)}")
+            try:
+                with run_lock(): regenerate(secs)
+            except Exception as e: print(f"❌ Rebuild failed: {e}")
+
+def minify_css(css):
+    """Drop comments and the whitespace around CSS punctuation, leaving quoted strings alone"""
+    def squeeze(c):
+        c = re.sub(r'\s*([{};,>])\s*', r'\1', re.sub(r'\s+', ' ', c))
+        return re.sub(r':\s+', ':', c).replace(';}', '}')
+    # split() puts each string at the odd indexes (None for a comment, which is dropped)
+    parts = re.split(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')|/\*.*?\*/""", css, flags=re.S)
+    out, text = [], ''
+    for i, p in enumerate(parts):
+        if i % 2 and p is not None: out += [squeeze(text), p]; text = ''
+        else: text += p or ''
+    return ''.join(out + [squeeze(text)]).strip()
+
+def minify_js(js):
+    """Drop comments and indentation. Strings, template literals and regexes pass
+    through untouched, and line breaks stay wherever semicolon insertion could need them."""
+    out, i, n = [], 0, len(js)
+    depth, tpl = 0, []  # brace depth, and the depth each open template ${ } resumes at
+    last = ''  # last significant character written
+    word = lambda c: c.isalnum() or c in '_$'
+    while i < n:
+        c = js[i]
+        if c == '`' or (c == '}' and tpl and tpl[-1] == depth):
+            if c == '}': tpl.pop()
+            j = i + 1
+            while j < n and js[j] != '`' and not js.startswith('${', j): j += 2 if js[j] == '\\' else 1
+            if js.startswith('${', j): tpl.append(depth); j += 2
+            else: j += 1
+        elif c in '\'"':
+            j = i + 1
+            while j < n and js[j] != c: j += 2 if js[j] == '\\' else 1
+            j += 1
+        elif js.startswith('//', i):
+            i = js.find('\n', i)
+            i = n if i < 0 else i
+            continue
+        elif js.startswith('/*', i):
+            i = js.find('*/', i) + 2
+            out.append(' ')
+            continue
+        elif c == '/' and (not last or last in '(,=:[!&|?{};+-*%<>~^' or re.search(r'\b(return|typeof|case)$', ''.join(out[-8:]))):
+            j, cls = i + 1, False
+            while j < n and (cls or js[j] != '/'):
+                if js[j] == '\\': j += 1
+                elif js[j] in '[]': cls = js[j] == '['
+                j += 1
+            j += 1
+            while j < n and js[j].isalpha(): j += 1
+        elif c.isspace():
+            j = i
+            while j < n and js[j].isspace(): j += 1
+            nxt = js[j] if j < n else ''
+            if '\n' in js[i:j]:
+                if last and last not in '{;,(=:?&|[' and nxt not in '})],.' and out[-1] != '\n': out.append('\n')
+            elif word(last[-1:] or ' ') and word(nxt or ' ') or last + nxt in ('++', '--', '+-', '-+'): out.append(' ')
+            i = j
+            continue
+        else:
+            depth += (c == '{') - (c == '}')
+            j = i + 1
+        out.append(js[i:j])
+        last = js[j - 1]
+        i = j
+    return ''.join(out).strip()
+
+def minify_html(html):
+    """Minified page and the (before, after) sizes of its markup, inline CSS and inline JS"""
+    sizes = {k: [0, 0] for k in ('html', 'css', 'js')}
+    def part(kind, text, fn):
+        small = fn(text)
+        sizes[kind][0] += len(text.encode()); sizes[kind][1] += len(small.encode())
+        return small
+    # Whitespace across lines between tags is indentation; within a line it may be a visible space
+    markup = lambda t: re.sub(r'\s+', ' ', re.sub(r'(^|>)\s*\n\s*(?=<|$)', r'\1', re.sub(r'<!--(?!\[).*?-->', '', t, flags=re.S)))
+    out, at = [], 0
+    for m in re.finditer(r'(<(script|style)\b[^>]*>)(.*?)(</\2>)', html, re.S | re.I):
+        kind = 'js' if m[2].lower() == 'script' else 'css'
+        out += [part('html', html[at:m.start()] + m[1], markup), part(kind, m[3], minify_js if kind == 'js' else minify_css), part('html', m[4], str)]
+        at = m.end()
+    out.append(part('html', html[at:], markup))
+    return ''.join(out).strip() + '\n', sizes
+
+def vendor(url):
+    """Local copy of an unpkg.com file under VENDOR_DIR, downloaded the first time; None if unavailable"""
+    pkg, name, ext = VENDORED.match(url).groups()
+    fp = os.path.join(VENDOR_DIR, pkg, f"{name}.{ext}")
+    if not os.path.exists(fp):
+        import urllib.request
+        try:
+            with urllib.request.urlopen(url, timeout=20) as r: body = r.read()
+        except OSError as e:
+            print(f"⚠️ Could not vendor {url} ({e}); the bundle keeps the CDN link")
+            return None
+        os.makedirs(os.path.dirname(fp), exist_ok=True)
+        write_if_changed(fp, body)
+        print(f"📥 Vendored {pkg}/{name}.{ext}")
+    with open(fp, 'rb') as f: return f.read()
+
+def build_bundle():
+    """--bundle: the deployable site in BUILD_DIR. The page is minified, with unpkg.com
+    libraries vendored under content-hashed names and the font stylesheet off the
+    critical path; the data files are copied; sw.js is filled in with the content
+    hashes of all but the run stamp; every file gets .gz (and, with brotli
+    installed, .br) siblings. Prints a size report when the page itself changed."""
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(HTML_FILE) as f: html = f.read()
+    files, report = {}, []  # name -> bytes; (component, source, minified, name)
+    for url in sorted(set(m[0] for m in VENDORED.finditer(html))):
+        body = vendor(url)
+        if body is None: continue
+        pkg, name, ext = VENDORED.match(url).groups()
+        hashed = f"{name}.{hashlib.sha256(body).hexdigest()[:10]}.{ext}"
+        html = html.replace(url, hashed)
+        files[hashed] = body
+        report.append((f"{pkg} {ext}", len(body), len(body), hashed))
+    # Fonts are a nicety: load their stylesheet without holding up first paint
+    html = re.sub(r'<link href="(https://fonts\.googleapis\.com/[^"]+)" rel="stylesheet">',
+                  lambda m: f'<link href="{m[1]}" rel="stylesheet" media="print" onload="this.media=\'all\'">', html)
+    html, sizes = minify_html(html)
+    files[os.path.basename(HTML_FILE)] = html.encode()
+    page = os.path.basename(HTML_FILE)
+    report = [(f"  inline {k}" if k != 'html' else "  markup", a, b, None) for k, (a, b) in sizes.items()] + report
+    report.insert(0, (page, sum(a for a, _ in sizes.values()), len(files[page]), page))
+    for fp in (DATA_FILE, STAMP_FILE):
+        with open(fp, 'rb') as f: files[os.path.basename(fp)] = f.read()
+    # The service worker precaches everything but the run stamp, by content hash
+    try:
+        with open(os.path.join(os.path.dirname(HTML_FILE), 'sw.js')) as f: sw = f.read()
+    except FileNotFoundError: print("⚠️ No sw.js next to the page; the bundle won't work offline")
+    else:
+        manifest = {n: hashlib.sha256(b).hexdigest()[:10] for n, b in files.items() if n != os.path.basename(STAMP_FILE)}
+        files['sw.js'] = minify_js(sw.replace('const MANIFEST = {};', f"const MANIFEST = {json.dumps(manifest, sort_keys=True)};", 1)).encode()
+        report.append(('sw.js', len(sw.encode()), len(files['sw.js']), 'sw.js'))
+    wrote = []
+    for name, body in files.items():
+        fp = os.path.join(BUILD_DIR, name)
+        if not write_if_changed(fp, body) and os.path.exists(fp + '.gz'): continue
+        wrote.append(name)
+        write_if_changed(fp + '.gz', gzip.compress(body, 9, mtime=0))
+        if brotli: write_if_changed(fp + '.br', brotli.compress(body))
+    # Hashed names from earlier builds are no longer linked from the page
+    for e in os.scandir(BUILD_DIR):
+        if e.name.removesuffix('.gz').removesuffix('.br') not in files: os.remove(e.path)
+    if not any(n not in (os.path.basename(DATA_FILE), os.path.basename(STAMP_FILE), 'sw.js') for n in wrote):
+        return print(f"📦 Bundle: {', '.join(wrote) or 'nothing'} updated in {BUILD_DIR}")
+    kb = lambda b: f"{b / 1024:.1f} KB" if b is not None else ''
+    packed = lambda b: (len(gzip.compress(b, 9, mtime=0)), len(brotli.compress(b)) if brotli else None)
+    print(f"📦 Bundle written to {BUILD_DIR}" + ('' if brotli else " (no .br: brotli not installed)"))
+    print(f"   {'component':<20}{'source':>10}{'minified':>10}{'gzip':>10}{'br':>10}")
+    for comp, a, b, name in report + [('data.json', len(files['data.json']), len(files['data.json']), 'data.json')]:
+        print(f"   {comp:<20}{kb(a):>10}{kb(b):>10}" + ''.join(f"{kb(v):>10}" for v in (packed(files[name]) if name else ())))
+    # What a first visit downloads: the page, its libraries and the data
+    first = [b for n, b in files.items() if n != os.path.basename(STAMP_FILE)]
+    print(f"   {'first visit':<20}{'':>10}{kb(sum(map(len, first))):>10}"
+          + ''.join(f"{kb(sum(v)):>10}" for v in zip(*map(packed, first)) if None not in v))
+def git(*args, input=None, timeout=None, **env):
+    """Run git against PUBLISH_GIT (plus any GIT_* env); returns stdout, raises CalledProcessError,
+    or TimeoutExpired after killing git and the transport helpers it started"""
+    p = subprocess.Popen(('git',) + args, stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+                         stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=env.get('GIT_WORK_TREE'),
+                         env={**os.environ, 'GIT_DIR': PUBLISH_GIT, **env}, start_new_session=True)
+    try: out, err = p.communicate(input, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        os.killpg(p.pid, signal.SIGKILL)  # ssh / remote-https would otherwise hold the pipes open
+        p.communicate()
+        raise
+    if p.returncode: raise subprocess.CalledProcessError(p.returncode, p.args, out, err)
+    return out.strip()
+
+def git_ref(r):
+    """r's commit in PUBLISH_GIT, or None if it doesn't exist yet"""
+    try: return git('rev-parse', '--verify', '--quiet', r)
+    except subprocess.CalledProcessError: return None
+
+def commit_site(remote):
+    """--publish, first half: commit BUILD_DIR for remote's PAGES_BRANCH as one parentless commit.
+
+    The commit is built in PUBLISH_GIT with plumbing, away from the page repo's
+    own index and history, and kept as the staged ref; push_site() then
+    force-pushes it over the last one. The previous commit is kept locally, so
+    a push only carries the files that changed, and the remote holds just the
+    current site however long this runs. remote is a remote name of the page's
+    repo, a URL or a path (a local bare repo for testing). Runs under run_lock,
+    as it reads BUILD_DIR; returns (url, ref) for push_site(), or None if
+    the remote already has this tree.
+    """
+    try: url = subprocess.run(['git', '-C', os.path.dirname(HTML_FILE), 'remote', 'get-url', remote],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError): url = os.path.abspath(remote) if os.path.exists(remote) else remote
+    ref = f"refs/published/{hashlib.sha1(url.encode()).hexdigest()[:12]}"  # url's PAGES_BRANCH as of our last push
+    staged = ref.replace('published', 'staged')  # the newest commit for url, pushed or not
+    if not os.path.isdir(PUBLISH_GIT): git('init', '--bare', '--quiet', PUBLISH_GIT)
+    last = None
+    for fetch in (False, True):
+        try:
+            if fetch: git('fetch', '--quiet', '--depth=1', url, f"+{PAGES_BRANCH}:{ref}", timeout=GIT_NET_TIMEOUT_S)
+            last = git('rev-parse', '--verify', '--quiet', f"{ref}^{{tree}}")
+            break
+        except subprocess.CalledProcessError: pass  # not pushed from here yet / the branch doesn't exist yet
+    if git_ref(staged): last = git('rev-parse', f"{staged}^{{tree}}")
+    # Pages compresses on its own, so the .gz/.br siblings stay out; .nojekyll skips its Jekyll build
+    work = {'GIT_WORK_TREE': BUILD_DIR, 'GIT_INDEX_FILE': os.path.join(PUBLISH_GIT, 'index')}
+    git('read-tree', '--empty', **work)
+    git('add', '--all', '--', '.', ':!*.gz', ':!*.br', **work)
+    git('update-index', '--add', '--cacheinfo', f"100644,{git('hash-object', '-w', '--stdin', input='')},.nojekyll", **work)
+    tree = git('write-tree', **work)
+    if tree != last:
+        who = {'GIT_AUTHOR_NAME': 'THC Fleet Map', 'GIT_AUTHOR_EMAIL': 'fleetmap@localhost'}
+        who.update(GIT_COMMITTER_NAME=who['GIT_AUTHOR_NAME'], GIT_COMMITTER_EMAIL=who['GIT_AUTHOR_EMAIL'])
+        git('update-ref', staged, git('commit-tree', tree, '-m', f"Publish {TODAY.strftime('%d %b %Y %H:%M')}", **who))
+    if git_ref(staged) in (None, git_ref(ref)): return print(f"🚀 {PAGES_BRANCH} already up to date")
+    return url, ref
+
+def push_site(url, ref):
+    """--publish, second half: push the staged commit to url's PAGES_BRANCH.
+
+    Runs after run_lock is released, so a slow network holds up neither --serve
+    nor the next run. Pushes take turns on a lock of their own and each sends
+    whatever is staged by then, so an older commit can't land after a newer one.
+    """
+    t0 = time.perf_counter()
+    with open(os.path.join(PUBLISH_GIT, 'push.lock'), 'w') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        want, last = git_ref(ref.replace('published', 'staged')), git_ref(ref)
+        if want == last: return print(f"🚀 {PAGES_BRANCH} already up to date")
+        changed = len(git('diff-tree', '-r', '--name-only', last, want).splitlines()) if last else None
+        git('push', '--quiet', '--force', url, f"{want}:refs/heads/{PAGES_BRANCH}", timeout=GIT_NET_TIMEOUT_S)
+        git('update-ref', ref, want)
+        git('gc', '--auto', '--quiet')  # default prune grace, as a run may be writing objects meanwhile
+    print(f"🚀 Published {want[:8]} to {url} {PAGES_BRANCH}" + (f" ({changed} files changed)" if changed is not None else '')
+          + f" in {time.perf_counter() - t0:.1f}s")
+
+class run_lock:
+    """Hold _build_lock and RUN_LOCK (flock) for one run, so no two runs overlap in this
+    process or across processes; .waited is how long it took to get them. With
+    wait=False it gives up at once if either is taken, and .held says whether it got them"""
+    def __init__(self, wait=True):
+        self.wait = wait
+
+    def __enter__(self):
+        t0 = time.perf_counter()
+        self.held = _build_lock.acquire(blocking=self.wait)
+        if not self.held: return self
+        try:
+            os.makedirs(os.path.dirname(RUN_LOCK), exist_ok=True)
+            self.f = open(RUN_LOCK, 'w')
+            try: fcntl.flock(self.f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                if not self.wait:
+                    self.f.close()
+                    self.held = False
+                    _build_lock.release()
+                    return self
+                print("⏳ Another run is in progress; waiting for it")
+                fcntl.flock(self.f, fcntl.LOCK_EX)
+        except BaseException:
+            _build_lock.release()
+            raise
+        self.waited = time.perf_counter() - t0
+        return self
+
+    def __exit__(self, *exc):
+        if not self.held: return
+        fcntl.flock(self.f, fcntl.LOCK_UN)
+        self.f.close()
+        _build_lock.release()
+
+def cron_field(f, lo, hi):
+    """Values a cron field allows: *, n, a-b, a,b and /step"""
+    vals = set()
+    for part in f.split(','):
+        rng, _, step = part.partition('/')
+        a, b = (lo, hi) if rng == '*' else map(int, rng.split('-')) if '-' in rng else (int(rng), hi if step else int(rng))
+        vals.update(range(a, b + 1, int(step or 1)))
+    return vals
+
+def next_cron(spec, after):
+    """First minute after `after` matching a 5-field cron spec"""
+    mi, hr, dom, mon, dow = (cron_field(f, lo, hi) for f, (lo, hi) in zip(spec.split(), ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))))
+    t = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+    for _ in range(366 * 24 * 60):
+        if t.month not in mon or t.day not in dom or (t.isoweekday() % 7 not in dow and t.isoweekday() not in dow):
+            t = (t + timedelta(days=1)).replace(hour=0, minute=0)
+        elif t.hour not in hr: t = (t + timedelta(hours=1)).replace(minute=0)
+        elif t.minute not in mi: t += timedelta(minutes=1)
+        else: return t
+    raise ValueError(f"cron spec {spec!r} never fires")
+
+class RunQueue:
+    """Pending run requests folded into one: triggers that arrive while a run is
+    queued or in progress merge into the next run instead of stacking up"""
+    def __init__(self):
+        self.cv, self.next = threading.Condition(), None
+
+    def trigger(self, why, sections=SECTIONS):
+        with self.cv:
+            if self.next is None: self.next = {'why': [], 'sections': set(), 'at': time.monotonic()}
+            if why not in self.next['why']: self.next['why'].append(why)
+            self.next['sections'] |= set(sections)
+            self.cv.notify()
+
+    def take(self):
+        with self.cv:
+            while self.next is None: self.cv.wait()
+            run, self.next = self.next, None
+            return run
+
+def scheduled_run(run, remote):
+    """One queued run: generate the requested sections, then publish straight away, logging each stage's latency"""
+    global TODAY
+    ms = lambda t: round(t * 1000, 1)
+    rec = {'why': run['why'], 'stages': {'queued': ms(time.monotonic() - run['at'])}}
+    def stage(name, fn, *a):
+        t0 = time.perf_counter()
+        try: return fn(*a)
+        except subprocess.CalledProcessError as e: rec['error'] = f"{name}: git {e.cmd[1]}: {e.stderr.strip()}"
+        except subprocess.TimeoutExpired as e: rec['error'] = f"{name}: git {e.cmd[1]} timed out after {e.timeout:.0f}s"
+        except Exception as e: rec['error'] = f"{name}: {e}"
+        finally: rec['stages'][name] = ms(time.perf_counter() - t0)
+    job = None
+    with run_lock() as lk:
+        rec['stages']['lock'] = ms(lk.waited)
+        TODAY = riyadh_now()
+        rec['at'] = TODAY.isoformat()
+        print(f"\n🔄 {TODAY.strftime('%H:%M:%S')} run for {', '.join(run['why'])}")
+        stage('generate', regenerate, [s for s in SECTIONS if s in run['sections']])
+        if remote and 'error' not in rec: job = stage('publish', commit_site, remote)
+    if job: stage('push', push_site, *job)  # off the lock: the next run needn't wait on the network
+    # From the first trigger to the site being live: what bounds how fresh the published map is
+    rec['ms'] = ms(time.monotonic() - run['at'])
+    print(f"⏱️ " + ', '.join(f"{n} {v:.0f}ms" for n, v in rec['stages'].items()) + f"; {rec['ms'] / 1000:.1f}s from trigger to done"
+          + (f"\n❌ Run failed at {rec['error']}" if 'error' in rec else ''))
+    try:
+        with open(SCHEDULE_LOG, 'a') as f: f.write(json.dumps(rec, separators=(',', ':'), ensure_ascii=False) + '\n')
+    except OSError as e: print(f"⚠️ Could not write schedule log: {e}")
+
+def schedule(specs, remote=None, on_change=False):
+    """--schedule: run at each cron time (and, with --watch, when notes change), publishing each run if remote is set"""
+    q = RunQueue()
+    def clock():
+        after = riyadh_now()
+        while True:
+            after, spec = min((next_cron(s, after), s) for s in specs)
+            # time.sleep() doesn't count time asleep on macOS, so wait in ticks against the wall clock
+            while (left := (after - riyadh_now()).total_seconds()) > 0: time.sleep(min(left, CLOCK_TICK_S))
+            q.trigger(f"cron {spec}")
+            after = max(after, riyadh_now())  # one run for times missed while asleep, not one each
+    threading.Thread(target=clock, daemon=True).start()
+    if on_change: threading.Thread(target=watch, args=(q.trigger,), daemon=True).start()
+    print(f"🗓️ Scheduled: {', '.join(specs)} (Riyadh time)" + (", and on vault changes" if on_change else '') + (f"; publishing to {remote}" if remote else ''))
+    try:
+        while True: scheduled_run(q.take(), remote)
+    except KeyboardInterrupt: pass
+
+_live = {}  # fleet, flights and bundle hash as last published to /events
+_subscribers, _sub_lock = set(), threading.Lock()
+
+def diff_fleet(a, b):
+    """Aircraft in b that are new or changed since a, and regs that are gone, or None; all of b if the bases changed"""
+    if a['bases'] != b['bases']: return {'full': b}
+    old, new = {h['reg']: h for h in a['helis']}, {h['reg']: h for h in b['helis']}
+    up, rm = [h for r, h in new.items() if old.get(r) != h], [r for r in old if r not in new]
+    return {'upsert': up, 'remove': rm} if up or rm else None
+
+def diff_flights(a, b):
+    """The day groups of b whose rows changed (null when gone), or all of b if the days moved"""
+    ta, tb = [g['title'] for g in a['groups']], [g['title'] for g in b['groups']]
+    if ta != tb or len(set(tb)) < len(tb): return {'full': b}
+    groups = {g['title']: g['rows'] for g, h in zip(b['groups'], a['groups']) if g['rows'] != h['rows']}
+    d = {'groups': groups} if groups else {}
+    if a['period'] != b['period']: d['period'] = b['period']
+    return d or None
+
+def publish(f, rebuilt, bundle_hash, stamp):
+    """Queue minimal /events updates for what this build changed"""
+    evs = []
+    for n, diff in (('fleet', diff_fleet), ('flights', diff_flights)):
+        d = diff(_live[n], f[n]) if n in rebuilt and _live.get(n) is not None and f.get(n) is not None else None
+        if d: evs.append((n, d))
+        if f.get(n) is not None: _live[n] = f[n]
+    other = [s for s in rebuilt if s not in ('fleet', 'flights')]
+    if other and bundle_hash != _live.get('hash'): evs.append(('sections', {'sections': other}))
+    if bundle_hash != _live.get('hash'):
+        _live['hash'] = bundle_hash
+        evs.append(('stamp', {**stamp, 'hash': bundle_hash}))
+    with _sub_lock:
+        for q in _subscribers:
+            for e in evs: q.put(e)
+
+_last_check = 0.0
+_variants = {}  # path -> (stat key, {encoding: (etag, body)})
+
+def refresh():
+    """Lazy single-flight rebuild for --serve: the first request after the inputs
+    change rebuilds; any request that finds a run in progress (this one's or a
+    scheduled run's) serves the current files, and the next one after it checks again"""
+    global TODAY, _last_check
+    with run_lock(wait=False) as lk:
+        if not lk.held: return
+        if time.monotonic() - _last_check < SERVE_CHECK_S: return
+        TODAY = riyadh_now()
+        stale = [s for s in SECTIONS if section_hash(s) != _hashes.get(s)]
+        if stale:
+            print(f"\n🔄 {TODAY.strftime('%H:%M:%S')} inputs changed, rebuilding {', '.join(stale)}")
+            try: regenerate(stale)
+            except Exception as e: print(f"❌ Rebuild failed: {e}")
+            for n in SERVE_PRIMED:
+                try: variants(os.path.join(site_dir(), n))
+                except OSError: pass
+        _last_check = time.monotonic()
+
+def site_dir():
+    """The folder --serve serves: BUILD_DIR with --bundle, otherwise the page's own"""
+    return BUILD_DIR if BUNDLE else os.path.dirname(HTML_FILE)
+
+def variants(fp):
+    """Identity, gzip and (with brotli installed) br bodies of fp with strong ETags, made once per file version"""
+    st = os.stat(fp)
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    hit = _variants.get(fp)
+    if hit and hit[0] == key: return hit[1]
+    with open(fp, 'rb') as f: raw = f.read()
+    def packed(ext, fn):
+        # --bundle has usually written this one already, as a sibling at least as new as fp
+        try:
+            if os.stat(fp + ext).st_mtime_ns >= st.st_mtime_ns:
+                with open(fp + ext, 'rb') as f: return f.read()
+        except OSError: pass
+        return fn(raw) if fn else None
+    tag = hashlib.sha256(raw).hexdigest()[:16]
+    v = {'identity': (f'"{tag}"', raw), 'gzip': (f'"{tag}-gz"', packed('.gz', lambda b: gzip.compress(b, 9, mtime=0)))}
+    br = packed('.br', brotli and brotli.compress)
+    if br is not None: v['br'] = (f'"{tag}-br"', br)
+    _variants[fp] = (key, v)
+    return v
+
+class ServeHandler(BaseHTTPRequestHandler):
+    """GET/HEAD for the files in site_dir(), revalidated by ETag"""
+    server_version = 'THCFleetMap'
+    protocol_version = 'HTTP/1.1'  # keep-alive, so a page load reuses one connection
+
+    def do_GET(self): self.events() if urlsplit(self.path).path == '/events' else self.reply()
+    def do_HEAD(self):
+        if urlsplit(self.path).path != '/events': return self.reply(head=True)
+        # The page probes with HEAD to tell --serve from static hosting before opening the stream
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+    def log_message(self, *a): pass
+
+    def events(self):
+        """Server-Sent Events: fleet and flights diffs, and which other sections to refetch"""
+        q = queue.Queue()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.close_connection = True
+        with _sub_lock: _subscribers.add(q)
+        try:
+            # The client compares this with the data.json it loaded, in case it missed an update while connecting
+            self.wfile.write(f"event: hello\ndata: {json.dumps({'hash': _live.get('hash')})}\n\n".encode())
+            self.wfile.flush()
+            quiet = time.monotonic()
+            while True:
+                refresh()  # listeners don't make requests, so the stream itself keeps watching the vault
+                try: n, d = q.get(timeout=SERVE_CHECK_S)
+                except queue.Empty:
+                    if time.monotonic() - quiet < SSE_PING_S: continue
+                    msg = ": ping\n\n"
+                else: msg = f"event: {n}\ndata: {json.dumps(d, separators=(',', ':'), ensure_ascii=False)}\n\n"
+                self.wfile.write(msg.encode())
+                self.wfile.flush()
+                quiet = time.monotonic()
+        except OSError: pass  # client went away
+        finally:
+            with _sub_lock: _subscribers.discard(q)
+
+    def reply(self, head=False):
+        root = os.path.realpath(site_dir())
+        name = unquote(urlsplit(self.path).path).lstrip('/') or os.path.basename(HTML_FILE)
+        fp = os.path.realpath(os.path.join(root, name))
+        # Just the site: whatever --bundle built, or the page's own files; no subfolders or dotfiles (.cache, .git)
+        if '/' in name or name.startswith('.') or not (BUNDLE or name in SERVE_FILES) or not fp.startswith(root + os.sep):
+            return self.send_error(404)
+        refresh()
+        try: v = variants(fp)
+        except OSError: return self.send_error(404)
+        ok = [t.split(';')[0].strip() for t in self.headers.get('Accept-Encoding', '').split(',') if not re.search(r';\s*q=0(\.0*)?\s*$', t)]
+        enc = next((e for e in ('br', 'gzip') if e in ok and e in v), 'identity')
+        etag, body = v[enc]
+        match = [t.strip() for t in self.headers.get('If-None-Match', '').split(',')]
+        self.send_response(304 if etag in match or '*' in match else 200)
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', 'no-cache')  # always revalidate; unchanged files cost a 304
+        self.send_header('Vary', 'Accept-Encoding')
+        if etag in match or '*' in match: return self.end_headers()
+        self.send_header('Content-Type', mimetypes.guess_type(fp)[0] or 'application/octet-stream')
+        if enc != 'identity': self.send_header('Content-Encoding', enc)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head: self.wfile.write(body)
+
+def serve(spec):
+    """--serve [HOST:]PORT: serve the page and its data, rebuilding lazily as requests come in"""
+    host, _, port = spec.rpartition(':')
+    srv = ThreadingHTTPServer((host or '0.0.0.0', int(port)), ServeHandler)
+    srv.daemon_threads = True
+    for n in SERVE_PRIMED:
+        try: variants(os.path.join(site_dir(), n))
+        except OSError: pass
+    print(f"🌐 Serving {site_dir()} at http://{host or 'localhost'}:{port}/" + ('' if brotli else " (gzip only: brotli not installed)"))
+    try: srv.serve_forever()
+    except KeyboardInterrupt: pass
+
+def print_expiring(when):
+    """--expiring: list currency lapsing from today up to a date or a number of days ahead"""
+    try: until = (TODAY + timedelta(days=int(when))).strftime("%Y-%m-%d")
+    except ValueError: until = datetime.strptime(when, "%Y-%m-%d").strftime("%Y-%m-%d")
+    load_cache()
+    hits = expiring(currency_index(load_currency()), until, TODAY.strftime("%Y-%m-%d"))
+    save_cache()
+    print(f"\n📅 Currency expiring before {until}: {len(hits) or 'none'}")
+    for d, k, nm, _ in hits: print(f"   {d}  {k:<10}  {nm}")
+
+def section_list(v):
+    secs = v.split(',')
+    bad = [s for s in secs if s not in SECTIONS]
+    if bad: raise argparse.ArgumentTypeError(f"unknown section {', '.join(bad)} (choose from {','.join(SECTIONS)})")
+    return [s for s in SECTIONS if s in secs]
+
+def main(vault, html, argv=None):
+    """Command line for the entry-point scripts, which supply their own vault and page paths"""
+    use_paths(vault, html)
+    ap = argparse.ArgumentParser(description="Regenerate the THC fleet map from the Obsidian vault")
+    ap.add_argument('--watch', action='store_true', help="keep running and rebuild affected sections when vault notes change")
+    ap.add_argument('--serve', nargs='?', const='8000', metavar='[HOST:]PORT', help="serve the page on the LAN (default port 8000), rebuilding when the vault has changed")
+    ap.add_argument('--expiring', metavar='DAYS|DATE', help="list pilot currency expiring in the next DAYS days or before DATE (YYYY-MM-DD), then exit")
+    ap.add_argument('--history', nargs='?', const='30', metavar='RANGE',
+                    help="report fleet availability, maintenance days and time at each base over RANGE, then exit: DAYS back to today (default 30), YYYY, YYYY-MM, YYYY-MM-DD or FROM..TO")
+    ap.add_argument('--section', type=section_list,
+                    help=f"rebuild just these sections ({','.join(SECTIONS)}) even if their inputs are unchanged")
+    ap.add_argument('--bundle', action='store_true', help="also write the minified, precompressed site with vendored libraries to dist/ (and --serve that)")
+    ap.add_argument('--publish', nargs='?', const='origin', metavar='REMOTE',
+                    help=f"push the bundle to REMOTE's {PAGES_BRANCH} branch as a single commit (default remote: origin); implies --bundle")
+    ap.add_argument('--schedule', nargs='*', metavar='CRON',
+                    help=f"keep running and regenerate (and --publish) at these cron times, Riyadh time (default: {', '.join(repr(c) for c in SCHEDULE)}); with --watch also on vault changes")
+    ap.add_argument('--metrics', action='store_true', help=f"append per-stage timings and I/O counts for each run to {METRICS_LOG}")
+    ap.add_argument('--profile', metavar='FILE', help="write a cProfile dump of the first run to FILE (read it with python -m pstats)")
+    args = ap.parse_args(argv)
+    if args.expiring:
+        try: return print_expiring(args.expiring)
+        except ValueError as e: ap.error(f"--expiring: {e}")
+    if args.history:
+        try: return print_history(args.history)
+        except ValueError as e: ap.error(f"--history: {e}")
+    global METRICS, BUNDLE
+    METRICS, BUNDLE = args.metrics, args.bundle or bool(args.publish)
+    print(f"\n🚁 THC Fleet Map Generator\n   {TODAY.strftime('%Y-%m-%d %H:%M:%S')}\n")
+    specs = args.schedule or SCHEDULE
+    if args.schedule is not None:
+        try: [next_cron(c, TODAY) for c in specs]
+        except ValueError as e: ap.error(f"--schedule: {e}")
+    run = (args.section, True) if args.section else (SECTIONS, False)
+    def publish_failed(e):
+        print(f"❌ Publish failed: git {e.cmd[1]}: " + (f"timed out after {e.timeout:.0f}s" if isinstance(e, subprocess.TimeoutExpired) else e.stderr.strip()))
+        if args.schedule is None: sys.exit(1)
+    job = None
+    with run_lock():
+        if args.profile:
+            import cProfile
+            cProfile.runctx('regenerate(*run)', globals(), locals(), args.profile)
+            print(f"📊 Profile written to {args.profile}")
+        else: regenerate(*run)
+        if args.publish:
+            try: job = commit_site(args.publish)
+            except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e: publish_failed(e)
+    if job:
+        try: push_site(*job)
+        except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as e: publish_failed(e)
+    print(f"\n✅ Done!")
+    if args.schedule is not None:
+        if args.serve: threading.Thread(target=serve, args=(args.serve,), daemon=True).start()
+        schedule(specs, args.publish, args.watch)
+    elif args.serve:
+        if args.watch: threading.Thread(target=watch, daemon=True).start()
+        serve(args.serve)
+    elif args.watch: watch()
@@ -0,0 +1,73 @@
+// Offline-first service worker for the fleet map.
+// MANIFEST maps the page, its data and its libraries to their content hashes;
+// `generate.py --bundle` fills it in for dist/, so a build that changes any of them
+// changes this file, and the browser installs it and fetches only the files whose
+// hash changed. Those are then served straight from cache, except data.json: live
+// updates refetch it between builds, so it always comes from the network while
+// there is one. Everything else of ours (the run stamp, or the whole site without
+// --bundle) is served from cache at once and revalidated in the background, and
+// open pages are told which files changed. Other origins are left to the browser.
+const MANIFEST = {};
+const CACHE = 'thc-fleetmap';
+const HASHES = 'manifest';  // cache entry holding the MANIFEST the cached files match
+const NETWORK_FIRST = ['data.json'];
+// Ours but never hashed: the run stamp is rewritten by every run, so cleanup leaves it be
+const UNHASHED = ['last-updated.json'];
+// The only other-origin files kept offline: the unbundled page's libraries. Map tiles and
+// fonts are not, as opaque responses each take megabytes of padded quota and never expire.
+const RUNTIME = ['https://unpkg.com/'];
+
+self.addEventListener('install', e => e.waitUntil((async () => {
+  const cache = await caches.open(CACHE);
+  const had = await cache.match(HASHES).then(r => r ? r.json() : {});
+  const stale = Object.keys(MANIFEST).filter(n => had[n] !== MANIFEST[n]);
+  await cache.addAll(stale.map(n => new Request(n, { cache: 'no-cache' })));
+  await cache.put(HASHES, new Response(JSON.stringify(MANIFEST)));
+  self.changed = Object.keys(had).length ? stale : [];  // a first install has nothing on screen to refresh
+  self.skipWaiting();
+})()));
+
+self.addEventListener('activate', e => e.waitUntil((async () => {
+  const cache = await caches.open(CACHE);
+  // Hashed names from older builds are never asked for again, and older workers cached other origins too
+  for (const req of await cache.keys()) {
+    const n = new URL(req.url).pathname.split('/').pop() || 'index.html';
+    const old = req.url.startsWith(self.registration.scope)
+      ? Object.keys(MANIFEST).length && !(n in MANIFEST) && n !== HASHES && !UNHASHED.includes(n)
+      : !RUNTIME.some(p => req.url.startsWith(p));
+    if (old) await cache.delete(req);
+  }
+  await self.clients.claim();
+  if (self.changed && self.changed.length) tell(self.changed);
+})()));
+
+async function tell(names) {
+  for (const c of await self.clients.matchAll()) c.postMessage({ updated: names });
+}
+
+self.addEventListener('fetch', e => {
+  const req = e.request;
+  if (req.method !== 'GET' || new URL(req.url).pathname.endsWith('/events')) return;
+  const nav = req.mode === 'navigate';
+  const key = nav ? new URL('index.html', self.registration.scope).href : req.url.split('?')[0];
+  const ours = key.startsWith(self.registration.scope), name = key.split('/').pop();
+  if (!ours && !RUNTIME.some(p => key.startsWith(p))) return;
+  const first = ours && NETWORK_FIRST.includes(name);
+  e.respondWith((async () => {
+    const cache = await caches.open(CACHE);
+    const hit = await cache.match(key);
+    // Files in the manifest are current until the next build replaces this worker
+    if (hit && ours && name in MANIFEST && !first) return hit;
+    const was = hit && !first && hit.clone();
+    const fresh = fetch(key, { cache: 'no-cache', mode: nav ? 'same-origin' : req.mode, credentials: req.credentials }).then(async r => {
+      if (!r.ok && r.type !== 'opaque') return r;
+      await cache.put(key, r.clone());
+      if (was && r.type !== 'opaque' && await was.text() !== await r.clone().text()) tell([name]);
+      return r;
+    });
+    if (!hit) return fresh;
+    if (first) return fresh.catch(() => hit);
+    e.waitUntil(fresh.catch(() => {}));  // offline: the cached copy is all there is
+    return hit;
+  })());
+});